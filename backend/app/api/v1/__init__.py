@@ -3,11 +3,27 @@ API v1 routes
 """
 from fastapi import APIRouter
 
-from app.api.v1 import tasks, projects, statuses, todos
+from app.core.config import settings
+from app.api.v1 import tasks, projects, statuses, todos, boards, bulk, stream, admin, assignees, export, timeline, stats, search
+from app.api.v1.async_session import use_async_session
 
 api_router = APIRouter()
 
+# DATABASE_MODE=async の場合は各ハンドラをAsyncSession上で実行する（A/B比較用）
+if settings.DATABASE_MODE == "async":
+    for module in (tasks, projects, statuses, todos, boards, bulk, assignees, timeline, stats, search):
+        use_async_session(module.router)
+
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(statuses.router, prefix="/statuses", tags=["statuses"])
 api_router.include_router(todos.router, prefix="/todos", tags=["todos"])
+api_router.include_router(assignees.router, prefix="/assignees", tags=["assignees"])
+api_router.include_router(boards.router, prefix="/boards", tags=["boards"])
+api_router.include_router(timeline.router, prefix="/timeline", tags=["timeline"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(bulk.router, tags=["bulk"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(stream.router, prefix="/stream", tags=["stream"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
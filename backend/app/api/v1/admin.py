@@ -0,0 +1,26 @@
+"""
+Admin API routes
+"""
+from fastapi import APIRouter, HTTPException, status
+
+from app.core import database
+from app.core.pool_stats import get_pool_stats
+from app.core.task_stats import reconcile_task_stats
+from app.schemas import PoolStatusResponse, TaskStatsReconcileResponse
+
+router = APIRouter()
+
+
+@router.get("/pool", response_model=PoolStatusResponse)
+def get_pool_status():
+    """Get connection pool statistics of this worker (checked-out connections, overflow, waits and wait-time percentiles)"""
+    return {"pools": get_pool_stats()}
+
+
+@router.post("/task-stats/reconcile", response_model=TaskStatsReconcileResponse)
+def reconcile_stats():
+    """Recompute the task_stats summary table from tasks now (PostgreSQL only)"""
+    if database.engine.dialect.name != "postgresql":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="task_stats is only maintained on PostgreSQL")
+    with database.engine.begin() as conn:
+        return {"corrected": reconcile_task_stats(conn)}
@@ -0,0 +1,31 @@
+"""
+Assignee API routes
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.query_budget import query_budget
+from app.core.assignee_directory import assignee_directory
+from app.core.etag import check_not_modified
+from app.core.versions import PROJECTS_SCOPE, TASKS_SCOPE, get_versions
+from app.schemas import AssigneeResponse
+
+router = APIRouter()
+
+
+def get_assignees_for(request: Request, response: Response, project_id: Optional[int], db: Session):
+    """Assignees with task counts, served from the assignee directory while tasks/projects are unchanged"""
+    versions = get_versions(db, [TASKS_SCOPE, PROJECTS_SCOPE])
+    not_modified = check_not_modified(request, response, versions)
+    if not_modified:
+        return not_modified
+    return assignee_directory.get(db, project_id, (versions[TASKS_SCOPE], versions[PROJECTS_SCOPE]))
+
+
+@router.get("", response_model=List[AssigneeResponse])
+@query_budget(3)
+def get_assignees(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get distinct assignees of all tasks and projects with their open task counts"""
+    return get_assignees_for(request, response, None, db)
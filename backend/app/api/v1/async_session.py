@@ -0,0 +1,58 @@
+"""
+Async session adapter for API routes
+
+The wrapped handlers run inside AsyncSession.run_sync, i.e. in a greenlet on
+the event loop thread: their queries are awaited on the async driver, but any
+other blocking call (a sync engine connection, a lock held across a query)
+stalls every request of the worker. Code reachable from handlers therefore
+uses the handler's session (publish_changes(events, db)) or the thread pool,
+and does not hold locks while querying (status_registry).
+"""
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, get_async_db
+
+
+def _uses_db(route: APIRoute) -> bool:
+    return any(
+        getattr(param.default, "dependency", None) is get_db
+        for param in inspect.signature(route.endpoint).parameters.values()
+    )
+
+
+def _async_endpoint(route: APIRoute):
+    """Wrap a sync handler so it runs on an AsyncSession instead of the thread pool"""
+    endpoint = route.endpoint
+    signature = inspect.signature(endpoint)
+    response_field = route.response_field
+    
+    def call(db, kwargs):
+        result = endpoint(db=db, **kwargs)
+        # 遅延ロードはイベントループ上では実行できないため、レスポンスモデルへの変換もセッション内で行う
+        if response_field is None or isinstance(result, Response):
+            return result
+        value, errors = response_field.validate(result, {}, loc=("response",))
+        return result if errors else value
+    
+    @functools.wraps(endpoint)
+    async def wrapper(db: AsyncSession, **kwargs):
+        return await db.run_sync(call, kwargs)
+    
+    wrapper.__signature__ = signature.replace(parameters=[
+        param.replace(default=Depends(get_async_db), annotation=AsyncSession) if name == "db" else param
+        for name, param in signature.parameters.items()
+    ])
+    return wrapper
+
+
+def use_async_session(router: APIRouter) -> APIRouter:
+    """Switch the router's get_db handlers to async endpoints (call before include_router)"""
+    for route in router.routes:
+        if isinstance(route, APIRoute) and _uses_db(route):
+            route.endpoint = _async_endpoint(route)
+    return router
@@ -0,0 +1,61 @@
+"""
+Board API routes
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import nullslast
+
+from app.core.database import get_db
+from app.core.query_budget import query_budget
+from app.core.etag import check_not_modified
+from app.core.status_registry import status_registry
+from app.core.versions import STATUSES_SCOPE, TASKS_SCOPE, TODOS_SCOPE, get_versions
+from app.models import Task
+from app.schemas import BoardResponse
+from app.api.v1.tasks import apply_task_filters
+from app.api.v1.statuses import get_common_statuses
+
+router = APIRouter()
+
+
+@router.get("", response_model=BoardResponse)
+@query_budget(6)
+def get_board(
+    request: Request,
+    response: Response,
+    project_id: Optional[int] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a Kanban board snapshot (statuses, tasks grouped by status and their todos) in one response"""
+    versions = get_versions(db, [TASKS_SCOPE, TODOS_SCOPE])
+    versions[STATUSES_SCOPE] = status_registry.get_version(db)
+    not_modified = check_not_modified(request, response, versions)
+    if not_modified:
+        return not_modified
+    
+    statuses = get_common_statuses(db)
+    
+    # TODOはタスクごとの遅延ロードではなく、selectinloadで1回のIN句クエリにまとめて取得する
+    query = apply_task_filters(db.query(Task), project_id, project_ids, assignee)
+    tasks = query.options(selectinload(Task.todos)).order_by(
+        nullslast(Task.status_id),
+        Task.order
+    ).all()
+    
+    # ステータスごとの列を作成（status_idで一致しない場合はstatus名で割り当てる）
+    columns = [{"status": s, "tasks": []} for s in statuses]
+    columns_by_id = {s.id: column for s, column in zip(statuses, columns)}
+    columns_by_name = {s.name: column for s, column in zip(statuses, columns)}
+    uncategorized = {"status": None, "tasks": []}
+    
+    for task in tasks:
+        column = columns_by_id.get(task.status_id) or columns_by_name.get(task.status) or uncategorized
+        column["tasks"].append(task)
+    
+    if uncategorized["tasks"]:
+        columns.append(uncategorized)
+    
+    return {"statuses": statuses, "columns": columns}
@@ -0,0 +1,240 @@
+"""
+Bulk API routes
+"""
+from datetime import datetime, date
+from typing import Any, Dict, List, Set, Tuple
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, update, delete
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+
+from app.core.database import get_db
+from app.core.events import publish_changes, task_event, todo_event
+from app.core.ranking import append_orders
+from app.core.status_registry import status_registry
+from app.models import Project, Task, Todo
+from app.schemas import (
+    TaskCreate, TaskUpdate, TodoCreate, TodoUpdate,
+    BulkMode, BulkItemError, BulkRequest, TaskBulkResponse, TodoBulkResponse,
+)
+
+router = APIRouter()
+
+
+def _validate_creates(items: List[Dict[str, Any]], schema, errors: List[BulkItemError]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Validate create items with the given schema (invalid items are recorded in errors)"""
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema(**item).dict()))
+        except ValidationError as e:
+            errors.append(BulkItemError(op="create", index=index, detail=e.errors(include_url=False, include_context=False)))
+    return valid
+
+
+def _validate_updates(items: List[Dict[str, Any]], schema, errors: List[BulkItemError]) -> List[Tuple[int, int, Dict[str, Any]]]:
+    """Validate update items ({"id": ..., <fields>}) with the given schema"""
+    valid = []
+    for index, item in enumerate(items):
+        data = dict(item)
+        item_id = data.pop("id", None)
+        if not isinstance(item_id, int):
+            errors.append(BulkItemError(op="update", index=index, detail="id is required"))
+            continue
+        try:
+            valid.append((index, item_id, schema(**data).dict(exclude_unset=True)))
+        except ValidationError as e:
+            errors.append(BulkItemError(op="update", index=index, id=item_id, detail=e.errors(include_url=False, include_context=False)))
+    return valid
+
+
+def _existing_ids(db: Session, column, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(column).filter(column.in_(ids))}
+
+
+def _check_errors(mode: BulkMode, errors: List[BulkItemError]) -> None:
+    """In atomic mode, reject the whole request if any item is invalid"""
+    if errors and mode == BulkMode.atomic:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Bulk request contains invalid items",
+                "errors": [error.dict() for error in errors],
+            }
+        )
+
+
+def _to_datetime(data: Dict[str, Any]) -> Dict[str, Any]:
+    # date型をdatetime型に変換
+    for field in ("scheduled_date", "completed_date"):
+        if data.get(field) is not None and isinstance(data[field], date) and not isinstance(data[field], datetime):
+            data[field] = datetime.combine(data[field], datetime.min.time())
+    return data
+
+
+def _todo_events(db: Session, changes: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+    """Build change events for (action, todo_id, task_id) with one lookup of the parent tasks"""
+    if not changes:
+        return []
+    task_ids = {task_id for _, _, task_id in changes}
+    parents = {row.id: row for row in db.query(Task.id, Task.project_id, Task.assignee).filter(Task.id.in_(task_ids))}
+    events = []
+    for action, todo_id, task_id in changes:
+        parent = parents.get(task_id)
+        events.append(todo_event(action, todo_id, task_id,
+                                 parent.project_id if parent else None, parent.assignee if parent else None))
+    return events
+
+
+def _write(db: Session, resource: str, write) -> Any:
+    """Run the batched writes in one transaction (write returns the response and its change events)"""
+    try:
+        result, events = write()
+        publish_changes(events, db)
+        db.commit()
+        return result
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot bulk update {resource} due to database constraints"
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
+    except Exception as e:
+        db.rollback()
+        raise
+
+
+@router.post("/tasks:bulk", response_model=TaskBulkResponse)
+def bulk_tasks(request: BulkRequest, db: Session = Depends(get_db)):
+    """Create, update and delete tasks in one transaction (multi-row INSERT ... RETURNING)"""
+    errors: List[BulkItemError] = []
+    creates = _validate_creates(request.create, TaskCreate, errors)
+    updates = _validate_updates(request.update, TaskUpdate, errors)
+    
+    # 参照先（プロジェクト・更新/削除対象のタスク）の存在確認はまとめて1回ずつ行う
+    project_ids = {data["project_id"] for _, data in creates}
+    project_ids |= {data["project_id"] for _, _, data in updates if data.get("project_id") is not None}
+    existing_projects = _existing_ids(db, Project.id, project_ids)
+    existing_tasks = _existing_ids(db, Task.id, {task_id for _, task_id, _ in updates} | set(request.delete))
+    
+    valid_creates = []
+    for index, data in creates:
+        if data["project_id"] == -1 and not data.get("assignee"):
+            errors.append(BulkItemError(op="create", index=index, detail="Assignee is required for personal tasks"))
+        elif data["project_id"] not in existing_projects:
+            errors.append(BulkItemError(op="create", index=index, detail=f"Project with id {data['project_id']} not found"))
+        else:
+            valid_creates.append(data)
+    
+    valid_updates = []
+    for index, task_id, data in updates:
+        if task_id not in existing_tasks:
+            errors.append(BulkItemError(op="update", index=index, id=task_id, detail=f"Task with id {task_id} not found"))
+        elif data.get("project_id") is not None and data["project_id"] not in existing_projects:
+            errors.append(BulkItemError(op="update", index=index, id=task_id, detail=f"Project with id {data['project_id']} not found"))
+        else:
+            valid_updates.append({"id": task_id, **data})
+    
+    delete_ids = []
+    for index, task_id in enumerate(request.delete):
+        if task_id not in existing_tasks:
+            errors.append(BulkItemError(op="delete", index=index, id=task_id, detail=f"Task with id {task_id} not found"))
+        else:
+            delete_ids.append(task_id)
+    
+    _check_errors(request.mode, errors)
+    
+    # ステータス名→共通ステータスIDはキャッシュからバッチ全体で1回だけ取得する
+    status_ids = status_registry.get_ids(db)
+    
+    for data in valid_creates:
+        if data.get("status_id") is None and data.get("status"):
+            data["status_id"] = status_ids.get(data["status"])
+    for data in valid_updates:
+        if "status" in data:
+            data["status_id"] = status_ids.get(data["status"])
+    
+    # 順序が指定されていない項目は、単体作成と同じく列（プロジェクト×ステータス）の末尾に順に追加
+    append_orders(db, Task, (Task.project_id, Task.status_id), valid_creates)
+    
+    def write():
+        created = db.scalars(insert(Task).returning(Task), valid_creates).all() if valid_creates else []
+        updated = []
+        if valid_updates:
+            db.execute(update(Task), valid_updates)
+            updated = db.query(Task).filter(Task.id.in_([data["id"] for data in valid_updates])).order_by(Task.id).all()
+        events = [task_event("created", task) for task in created] + [task_event("updated", task) for task in updated]
+        if delete_ids:
+            # 削除前に購読フィルタ用の列だけ取得しておく
+            deleted = db.query(Task.id, Task.project_id, Task.assignee, Task.status_id).filter(Task.id.in_(delete_ids)).all()
+            events += [task_event("deleted", row) for row in deleted]
+            # todosの外部キーにON DELETE CASCADEがない環境もあるため、先にTODOを削除する
+            db.execute(delete(Todo).where(Todo.task_id.in_(delete_ids)))
+            db.execute(delete(Task).where(Task.id.in_(delete_ids)))
+        return TaskBulkResponse(created=created, updated=updated, deleted=delete_ids, errors=errors), events
+    
+    return _write(db, "tasks", write)
+
+
+@router.post("/todos:bulk", response_model=TodoBulkResponse)
+def bulk_todos(request: BulkRequest, db: Session = Depends(get_db)):
+    """Create, update and delete todos in one transaction (multi-row INSERT ... RETURNING)"""
+    errors: List[BulkItemError] = []
+    creates = _validate_creates(request.create, TodoCreate, errors)
+    updates = _validate_updates(request.update, TodoUpdate, errors)
+    
+    existing_tasks = _existing_ids(db, Task.id, {data["task_id"] for _, data in creates})
+    existing_todos = _existing_ids(db, Todo.id, {todo_id for _, todo_id, _ in updates} | set(request.delete))
+    
+    valid_creates = []
+    for index, data in creates:
+        if data["task_id"] not in existing_tasks:
+            errors.append(BulkItemError(op="create", index=index, detail=f"Task with id {data['task_id']} not found"))
+        else:
+            valid_creates.append(_to_datetime(data))
+    
+    valid_updates = []
+    for index, todo_id, data in updates:
+        if todo_id not in existing_todos:
+            errors.append(BulkItemError(op="update", index=index, id=todo_id, detail=f"Todo with id {todo_id} not found"))
+            continue
+        data = _to_datetime(data)
+        # 実行完了日が設定された場合は自動的にcompletedをtrueに、削除された場合はfalseに
+        if "completed_date" in data:
+            data["completed"] = data["completed_date"] is not None
+        valid_updates.append({"id": todo_id, **data})
+    
+    delete_ids = []
+    for index, todo_id in enumerate(request.delete):
+        if todo_id not in existing_todos:
+            errors.append(BulkItemError(op="delete", index=index, id=todo_id, detail=f"Todo with id {todo_id} not found"))
+        else:
+            delete_ids.append(todo_id)
+    
+    _check_errors(request.mode, errors)
+    
+    # 順序が指定されていない項目は、単体作成と同じくタスク内の末尾に順に追加
+    append_orders(db, Todo, (Todo.task_id,), valid_creates)
+    
+    def write():
+        created = db.scalars(insert(Todo).returning(Todo), valid_creates).all() if valid_creates else []
+        updated = []
+        if valid_updates:
+            db.execute(update(Todo), valid_updates)
+            updated = db.query(Todo).filter(Todo.id.in_([data["id"] for data in valid_updates])).order_by(Todo.id).all()
+        changes = [("created", todo.id, todo.task_id) for todo in created] + [("updated", todo.id, todo.task_id) for todo in updated]
+        if delete_ids:
+            changes += [("deleted", row.id, row.task_id) for row in db.query(Todo.id, Todo.task_id).filter(Todo.id.in_(delete_ids))]
+            db.execute(delete(Todo).where(Todo.id.in_(delete_ids)))
+        return TodoBulkResponse(created=created, updated=updated, deleted=delete_ids, errors=errors), _todo_events(db, changes)
+    
+    return _write(db, "todos", write)
@@ -0,0 +1,102 @@
+"""
+Export API routes (streamed NDJSON / CSV)
+"""
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter
+
+from app.core import database
+from app.core.query_budget import query_budget
+from app.core.export import ExportFormat, export_response
+from app.api.v1.tasks import apply_task_filters
+from app.api.v1.todos import apply_todo_filters, parse_todo_sort, project_name_column, todo_list_item, todo_list_query
+from app.models import Task, Project
+
+router = APIRouter()
+
+TASK_EXPORT_FIELDS = [
+    "id", "project_id", "project_name", "title", "description", "status", "status_id",
+    "assignee", "completed", "order", "created_at", "updated_at",
+]
+
+TODO_EXPORT_FIELDS = [
+    "id", "task_id", "task_name", "project_id", "project_name", "title", "completed", "order",
+    "scheduled_date", "completed_date", "created_at", "updated_at",
+]
+
+
+def task_export_item(row) -> dict:
+    """Serialize a row of the task export query"""
+    return {
+        "id": row.id,
+        "project_id": row.project_id,
+        "project_name": row.project_name,
+        "title": row.title,
+        "description": row.description,
+        "status": row.status,
+        "status_id": row.status_id,
+        "assignee": row.assignee,
+        "completed": row.completed,
+        "order": row.order,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+@router.get("/tasks")
+@query_budget(1)
+def export_tasks(
+    format: ExportFormat = ExportFormat.ndjson,
+    project_id: Optional[int] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+):
+    """Stream every task matching the filters of GET /tasks (id order)"""
+    db = database.SessionLocal()
+    try:
+        query = db.query(
+            Task.id,
+            Task.project_id,
+            project_name_column.label("project_name"),
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.status_id,
+            Task.assignee,
+            Task.completed,
+            Task.order,
+            Task.created_at,
+            Task.updated_at,
+        ).outerjoin(Project, Task.project_id == Project.id)
+        query = apply_task_filters(query, project_id, project_ids, assignee).order_by(Task.id)
+    except Exception:
+        db.close()
+        raise
+    return export_response(db, query, TASK_EXPORT_FIELDS, task_export_item, format, "tasks")
+
+
+@router.get("/todos")
+@query_budget(1)
+def export_todos(
+    format: ExportFormat = ExportFormat.ndjson,
+    completed: Optional[bool] = None,
+    scheduled_from: Optional[date] = None,
+    scheduled_to: Optional[date] = None,
+    completed_from: Optional[date] = None,
+    completed_to: Optional[date] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    """Stream every todo matching the filters and sort of GET /todos"""
+    db = database.SessionLocal()
+    try:
+        query = apply_todo_filters(
+            todo_list_query(db), completed, scheduled_from, scheduled_to,
+            completed_from, completed_to, project_ids, assignee, q
+        ).order_by(*parse_todo_sort(sort))
+    except Exception:
+        db.close()
+        raise
+    return export_response(db, query, TODO_EXPORT_FIELDS, todo_list_item, format, "todos")
@@ -1,43 +1,63 @@
 """
 Project API routes
 """
-import json
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from app.core.database import get_db
-from app.models import Project, Status
-from app.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.core.query_budget import query_budget
+from app.core.etag import check_not_modified
+from app.core.events import publish_changes, project_event
+from app.core.versions import PROJECTS_SCOPE, get_versions
+from app.core.responses import json_response, row_dicts
+from app.api.v1.assignees import get_assignees_for
+from app.models import Project, ProjectAssignee, Status
+from app.schemas import ProjectCreate, ProjectUpdate, ProjectResponse, AssigneeResponse
 from app.core.constants import DEFAULT_STATUS_DEFINITIONS
 
 router = APIRouter()
 
+# 一覧ではProjectResponseの項目（担当者を除く）だけを行として取得する
+PROJECT_RESPONSE_COLUMNS = [getattr(Project, name) for name in ProjectResponse.model_fields if name != "assignee"]
 
-@router.get("", response_model=List[ProjectResponse])
-def get_projects(assignee: Optional[str] = None, db: Session = Depends(get_db)):
-    """Get all projects"""
-    query = db.query(Project)
+
+def project_list(db: Session, assignee: Optional[str] = None) -> List[dict]:
+    """Projects as plain dicts shaped like ProjectResponse, newest first (2 queries)"""
+    query = db.query(*PROJECT_RESPONSE_COLUMNS)
     
     if assignee:
-        query = query.filter(Project.assignee.like(f'%"{assignee}"%'))
+        # project_assignees (assignee, project_id) のインデックスで絞り込む
+        query = query.filter(Project.assignee_rows.any(ProjectAssignee.assignee == assignee))
     
-    projects = query.order_by(Project.created_at.desc()).all()
+    projects = row_dicts(query.order_by(Project.created_at.desc()))
     
-    # assigneeをリストに変換
+    # 担当者は入力順にIN句1回でまとめて取得する
+    assignees = {project["id"]: [] for project in projects}
+    if assignees:
+        rows = db.query(ProjectAssignee.project_id, ProjectAssignee.assignee).filter(
+            ProjectAssignee.project_id.in_(assignees.keys())
+        ).order_by(ProjectAssignee.project_id, ProjectAssignee.position)
+        for project_id, name in rows:
+            assignees[project_id].append(name)
     for project in projects:
-        if project.assignee:
-            try:
-                project.assignee = json.loads(project.assignee)
-            except:
-                project.assignee = []
-        else:
-            project.assignee = []
+        project["assignee"] = assignees[project["id"]]
     
     return projects
 
 
+@router.get("", response_model=List[ProjectResponse])
+@query_budget(3)
+def get_projects(request: Request, response: Response, assignee: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get all projects"""
+    not_modified = check_not_modified(request, response, get_versions(db, [PROJECTS_SCOPE]))
+    if not_modified:
+        return not_modified
+    
+    return json_response(project_list(db, assignee), response)
+
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project(project_id: int, db: Session = Depends(get_db)):
     """Get a single project by ID"""
@@ -45,27 +65,21 @@ def get_project(project_id: int, db: Session = Depends(get_db)):
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Project with id {project_id} not found")
     
-    # assigneeをリストに変換
-    if project.assignee:
-        try:
-            project.assignee = json.loads(project.assignee)
-        except:
-            project.assignee = []
-    else:
-        project.assignee = []
-    
     return project
 
 
+@router.get("/{project_id}/assignees", response_model=List[AssigneeResponse])
+@query_budget(3)
+def get_project_assignees(project_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get distinct assignees of a project (project members and task assignees) with their open task counts"""
+    return get_assignees_for(request, response, project_id, db)
+
+
 @router.post("", response_model=ProjectResponse)
 def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     """Create a new project"""
     project_dict = project.dict()
     
-    # assigneeをJSON文字列に変換
-    if project_dict.get("assignee") is not None:
-        project_dict["assignee"] = json.dumps(project_dict["assignee"], ensure_ascii=False)
-    
     try:
         db_project = Project(**project_dict)
         db.add(db_project)
@@ -73,15 +87,9 @@ def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
         
         # ステータスは共通化されているため、プロジェクト作成時にステータスを作成しない
         
+        publish_changes([project_event("created", db_project.id)], db)
         db.commit()
         db.refresh(db_project)
-        
-        # レスポンス用にassigneeをリストに変換
-        if db_project.assignee:
-            db_project.assignee = json.loads(db_project.assignee)
-        else:
-            db_project.assignee = []
-        
         return db_project
     except IntegrityError as e:
         db.rollback()
@@ -112,25 +120,13 @@ def update_project(project_id: int, project_update: ProjectUpdate, db: Session =
     
     update_data = project_update.dict(exclude_unset=True)
     
-    if "assignee" in update_data and update_data["assignee"] is not None:
-        update_data["assignee"] = json.dumps(update_data["assignee"], ensure_ascii=False)
-    
     try:
         for field, value in update_data.items():
             setattr(db_project, field, value)
         
+        publish_changes([project_event("updated", db_project.id)], db)
         db.commit()
         db.refresh(db_project)
-        
-        # レスポンス用にassigneeをリストに変換
-        if db_project.assignee:
-            try:
-                db_project.assignee = json.loads(db_project.assignee)
-            except:
-                db_project.assignee = []
-        else:
-            db_project.assignee = []
-        
         return db_project
     except IntegrityError as e:
         db.rollback()
@@ -160,6 +156,7 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Project with id {project_id} not found")
     
     try:
+        publish_changes([project_event("deleted", project_id)], db)
         db.delete(db_project)
         db.commit()
         return {"message": "Project deleted successfully"}
@@ -0,0 +1,128 @@
+"""
+Search API routes (task titles/descriptions and todo titles)
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import case, func, literal, literal_column, or_, text, union_all
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.query_budget import query_budget
+from app.core.etag import check_not_modified
+from app.core.versions import PROJECTS_SCOPE, TASKS_SCOPE, TODOS_SCOPE, get_versions
+from app.core.search_index import tasks_fts, todos_fts
+from app.api.v1.todos import contains, parse_project_ids, project_name_column
+from app.models import Project, Task, Todo
+from app.schemas import SearchResponse
+
+router = APIRouter()
+
+# 説明文・TODOでの一致はタイトルでの一致より低く評価する
+DESCRIPTION_WEIGHT = 0.5
+TODO_WEIGHT = 0.8
+
+# FTS5のtrigramは3文字未満の語を検索できない
+FTS_MIN_LENGTH = 3
+
+
+def fts_phrase(q: str) -> str:
+    """q as a single FTS5 phrase (quotes escaped, so operators in q are matched literally)"""
+    return '"' + q.replace('"', '""') + '"'
+
+
+def hit_columns(kind: str, id_column, title_column, score):
+    return (
+        literal(kind).label("type"),
+        id_column.label("id"),
+        Task.id.label("task_id"),
+        Task.project_id.label("project_id"),
+        project_name_column.label("project_name"),
+        title_column.label("title"),
+        Task.title.label("task_title"),
+        score.label("score"),
+    )
+
+
+def task_hits(db: Session, q: str):
+    """Tasks whose title or description contains q, with a relevance score"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # ix_tasks_title_trgm / ix_tasks_description_trgm（GIN）で絞り込み、word_similarityで順位付け
+        score = func.greatest(
+            func.word_similarity(q, Task.title),
+            func.word_similarity(q, func.coalesce(Task.description, "")) * DESCRIPTION_WEIGHT,
+        )
+        query = db.query(*hit_columns("task", Task.id, Task.title, score)).filter(
+            or_(contains(Task.title, q), contains(Task.description, q))
+        )
+    elif dialect == "sqlite" and len(q) >= FTS_MIN_LENGTH:
+        # bm25は小さいほど一致度が高いため符号を反転する
+        score = -func.bm25(literal_column("tasks_fts"), 1.0, DESCRIPTION_WEIGHT)
+        query = db.query(*hit_columns("task", Task.id, Task.title, score)).select_from(tasks_fts).join(
+            Task, Task.id == tasks_fts.c.rowid
+        ).filter(text("tasks_fts MATCH :task_phrase").bindparams(task_phrase=fts_phrase(q)))
+    else:
+        score = case((contains(Task.title, q), 1.0), else_=DESCRIPTION_WEIGHT)
+        query = db.query(*hit_columns("task", Task.id, Task.title, score)).filter(
+            or_(contains(Task.title, q), contains(Task.description, q))
+        )
+    return query.outerjoin(Project, Task.project_id == Project.id)
+
+
+def todo_hits(db: Session, q: str):
+    """Todos whose title contains q, with a relevance score"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # ix_todos_title_trgm（GIN）
+        score = func.word_similarity(q, Todo.title) * TODO_WEIGHT
+        query = db.query(*hit_columns("todo", Todo.id, Todo.title, score)).filter(contains(Todo.title, q))
+    elif dialect == "sqlite" and len(q) >= FTS_MIN_LENGTH:
+        score = -func.bm25(literal_column("todos_fts")) * TODO_WEIGHT
+        query = db.query(*hit_columns("todo", Todo.id, Todo.title, score)).select_from(todos_fts).join(
+            Todo, Todo.id == todos_fts.c.rowid
+        ).filter(text("todos_fts MATCH :todo_phrase").bindparams(todo_phrase=fts_phrase(q)))
+    else:
+        query = db.query(*hit_columns("todo", Todo.id, Todo.title, literal(TODO_WEIGHT))).filter(
+            contains(Todo.title, q)
+        )
+    return query.join(Task, Todo.task_id == Task.id).outerjoin(Project, Task.project_id == Project.id)
+
+
+@router.get("", response_model=SearchResponse)
+@query_budget(2)
+def search(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Tasks and todos matching q across projects, most relevant first
+    
+    Matches are substrings of task titles, task descriptions and todo titles
+    (Japanese included). PostgreSQL ranks with pg_trgm word_similarity, SQLite
+    with FTS5 bm25; title matches rank above description and todo matches.
+    """
+    q = q.strip()
+    project_id_list = parse_project_ids(project_ids) if project_ids else None
+    
+    not_modified = check_not_modified(request, response, get_versions(db, [TASKS_SCOPE, TODOS_SCOPE, PROJECTS_SCOPE]))
+    if not_modified:
+        return not_modified
+    if not q:
+        return {"q": q, "hits": []}
+    
+    def scoped(query):
+        if project_id_list is not None:
+            query = query.filter(Task.project_id.in_(project_id_list))
+        if assignee:
+            query = query.filter(Task.assignee == assignee)
+        return query
+    
+    # タスクとTODOの一致を1文でまとめて順位付け
+    hits = union_all(scoped(task_hits(db, q)).statement, scoped(todo_hits(db, q)).statement).subquery()
+    rows = db.query(hits).order_by(hits.c.score.desc(), hits.c.type, hits.c.id).limit(limit).all()
+    
+    return {"q": q, "hits": [dict(row._mapping) for row in rows]}
@@ -0,0 +1,65 @@
+"""
+Dashboard statistics API routes
+"""
+from collections import Counter
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.query_budget import query_budget
+from app.core.etag import check_not_modified
+from app.core.versions import PROJECTS_SCOPE, STATUSES_SCOPE, TASKS_SCOPE, get_versions
+from app.core.status_registry import status_registry
+from app.core.task_stats import task_stats_query
+from app.models import Project
+from app.schemas import StatsResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=StatsResponse)
+@query_budget(4)
+def get_stats(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Task counts per status, per project and per assignee (read from the task_stats summary table)"""
+    not_modified = check_not_modified(
+        request, response, get_versions(db, [TASKS_SCOPE, PROJECTS_SCOPE, STATUSES_SCOPE])
+    )
+    if not_modified:
+        return not_modified
+    
+    stats = task_stats_query(db).subquery()
+    rows = db.query(stats, Project.name.label("project_name")).outerjoin(
+        Project, Project.id == stats.c.project_id
+    ).all()
+    
+    by_status: Counter = Counter()
+    by_project: Counter = Counter()
+    by_assignee: Counter = Counter()
+    project_names = {}
+    for row in rows:
+        by_status[row.status_id or None] += row.count
+        by_project[row.project_id] += row.count
+        by_assignee[row.assignee or None] += row.count
+        project_names[row.project_id] = row.project_name
+    
+    statuses = {status.id: status for status in status_registry.get_statuses(db)}
+    return {
+        "total": sum(by_project.values()),
+        "by_status": [
+            {
+                "status_id": status_id,
+                "name": statuses[status_id].name if status_id in statuses else None,
+                "display_name": statuses[status_id].display_name if status_id in statuses else None,
+                "count": count,
+            }
+            for status_id, count in by_status.most_common()
+        ],
+        "by_project": [
+            {"project_id": project_id, "name": project_names[project_id], "count": count}
+            for project_id, count in by_project.most_common()
+        ],
+        "by_assignee": [
+            {"assignee": assignee, "count": count}
+            for assignee, count in by_assignee.most_common()
+        ],
+    }
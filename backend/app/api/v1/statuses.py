@@ -2,47 +2,41 @@
 Status API routes
 """
 import logging
-from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from app.core.database import get_db
+from app.core.query_budget import query_budget
 from app.models import Status
 from app.schemas import StatusCreate, StatusUpdate, StatusResponse
 from app.core.constants import DEFAULT_PERSONAL_STATUSES
+from app.core.status_registry import status_registry
+from app.core.events import publish_changes, status_event
+from app.core.etag import check_not_modified
+from app.core.responses import json_response
+from app.core.versions import STATUSES_SCOPE
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def get_common_statuses(db: Session) -> List[StatusResponse]:
+    """Get common statuses ordered by display order (served from the in-process status registry)"""
+    return status_registry.get_statuses(db)
+
+
 @router.get("", response_model=List[StatusResponse])
-def get_statuses(project_id: Optional[int] = None, db: Session = Depends(get_db)):
+@query_budget(2)
+def get_statuses(request: Request, response: Response, project_id: Optional[int] = None, db: Session = Depends(get_db)):
     """Get common statuses (all projects and personal tasks share the same 7 statuses)"""
     try:
-        # 共通ステータスを取得（project_id IS NULL）
-        query = db.query(Status).filter(Status.project_id.is_(None))
-        statuses = query.order_by(Status.order).all()
-        
-        # 共通ステータスが存在しない場合は、デフォルトステータスを返す（マイグレーション前の互換性のため）
-        if not statuses:
-            from app.core.constants import DEFAULT_STATUS_DEFINITIONS
-            # 仮想的なステータスレスポンスを返す
-            return [
-                StatusResponse(
-                    id=idx,
-                    name=status["name"],
-                    display_name=status["display_name"],
-                    order=status["order"],
-                    color=status["color"],
-                    project_id=None,
-                    created_at=datetime.now()
-                )
-                for idx, status in enumerate(DEFAULT_STATUS_DEFINITIONS)
-            ]
-        
-        return statuses
+        # ステータスはキャッシュから返すため、ETagもキャッシュのバージョンから計算する（DBアクセスなし）
+        not_modified = check_not_modified(request, response, {STATUSES_SCOPE: status_registry.get_version(db)})
+        if not_modified:
+            return not_modified
+        return json_response(status_registry.get_statuses_json(db), response)
     except Exception as e:
         logger.error(f"Error fetching statuses: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching statuses")
@@ -61,7 +55,10 @@ def create_status(status: StatusCreate, db: Session = Depends(get_db)):
     try:
         db_status = Status(**status.dict())
         db.add(db_status)
+        db.flush()
+        publish_changes([status_event("created", db_status.id)], db)
         db.commit()
+        status_registry.invalidate()
         db.refresh(db_status)
         return db_status
     except IntegrityError as e:
@@ -93,7 +90,9 @@ def update_status(status_id: int, status_update: StatusUpdate, db: Session = Dep
         for field, value in update_data.items():
             setattr(db_status, field, value)
         
+        publish_changes([status_event("updated", db_status.id)], db)
         db.commit()
+        status_registry.invalidate()
         db.refresh(db_status)
         return db_status
     except IntegrityError as e:
@@ -121,8 +120,10 @@ def delete_status(status_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Status with id {status_id} not found")
     
     try:
+        publish_changes([status_event("deleted", status_id)], db)
         db.delete(db_status)
         db.commit()
+        status_registry.invalidate()
         return {"message": "Status deleted successfully"}
     except IntegrityError as e:
         db.rollback()
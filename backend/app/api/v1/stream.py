@@ -0,0 +1,61 @@
+"""
+Change stream API routes (Server-Sent Events)
+"""
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.events import get_broker
+from app.api.v1.todos import parse_project_ids
+
+router = APIRouter()
+
+# 接続維持用のコメントを送る間隔（秒）
+KEEPALIVE_INTERVAL = 15
+
+
+@router.get("")
+async def stream_changes(
+    request: Request,
+    project_id: Optional[int] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+):
+    """Stream task / todo / status / project change events as Server-Sent Events"""
+    if project_id is not None:
+        subscribed_projects = {project_id}
+    elif project_ids:
+        subscribed_projects = set(parse_project_ids(project_ids))
+    else:
+        subscribed_projects = None
+    
+    broker = get_broker()
+    subscription = broker.subscribe(subscribed_projects, assignee)
+    
+    async def events():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                if subscription.overflowed:
+                    # イベントを取りこぼしたため、クライアントに全体の再取得を促す
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    subscription.overflowed = False
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,30 +2,36 @@
 Task API routes
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import nullslast
+from sqlalchemy import Float, Integer, String, cast, column, nullslast, tuple_, or_, and_, update, values
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from app.core.database import get_db
-from app.models import Task, Status, Todo
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TodoCreate, TodoResponse
+from app.core.query_budget import query_budget
+from app.core.etag import check_not_modified
+from app.core.versions import TASKS_SCOPE, get_versions
+from app.core.pagination import decode_cursor, next_cursor
+from app.core.status_registry import status_registry
+from app.core.events import publish_changes, task_event, todo_event
+from app.core.ranking import rank_between, needs_rebalance, next_order, respace_around, task_column, todo_column
+from app.core.responses import json_response, row_dicts
+from app.models import Task, Todo
+from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskMove, TaskPosition, TodoCreate, TodoResponse
 
 router = APIRouter()
 
+# 一覧ではTaskResponseの項目だけを行として取得する（ORMオブジェクトを作らない）
+TASK_RESPONSE_COLUMNS = [getattr(Task, name) for name in TaskResponse.model_fields]
 
-@router.get("", response_model=List[TaskResponse])
-def get_tasks(
+
+def apply_task_filters(
+    query,
     project_id: Optional[int] = None,
     project_ids: Optional[str] = None,
     assignee: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
 ):
-    """Get tasks with optional filtering"""
-    query = db.query(Task)
-    
+    """Apply the project / assignee filters shared by the task list endpoints"""
     if project_id is not None:
         query = query.filter(Task.project_id == project_id)
         if assignee:
@@ -61,11 +67,160 @@ def get_tasks(
     elif assignee:
         query = query.filter((Task.project_id == -1) & (Task.assignee == assignee))
     
-    tasks = query.order_by(
+    return query
+
+
+def apply_task_cursor(query, after: str):
+    """Restrict query to tasks after the cursor in (status_id NULLS LAST, order, id) order"""
+    status_id, order, task_id = decode_cursor(after, 3)
+    after_in_column = tuple_(Task.order, Task.id) > tuple_(order, task_id)
+    
+    if status_id is None:
+        return query.filter(Task.status_id.is_(None), after_in_column)
+    return query.filter(or_(
+        Task.status_id > status_id,
+        Task.status_id.is_(None),
+        and_(Task.status_id == status_id, after_in_column),
+    ))
+
+
+def task_list_query(
+    db: Session,
+    project_id: Optional[int] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    after: Optional[str] = None,
+):
+    """Task list rows (TaskResponse columns) in (status_id NULLS LAST, order, id) order"""
+    query = apply_task_filters(db.query(*TASK_RESPONSE_COLUMNS), project_id, project_ids, assignee)
+    
+    if after:
+        query = apply_task_cursor(query, after)
+    
+    return query.order_by(
         nullslast(Task.status_id),
-        Task.order
-    ).offset(skip).limit(limit).all()
-    return tasks
+        Task.order,
+        Task.id
+    )
+
+
+@router.get("", response_model=List[TaskResponse])
+@query_budget(3)
+def get_tasks(
+    request: Request,
+    response: Response,
+    project_id: Optional[int] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    after: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Get tasks with optional filtering (skip/limit, or keyset paging with `after`=X-Next-Cursor header)"""
+    not_modified = check_not_modified(request, response, get_versions(db, [TASKS_SCOPE]))
+    if not_modified:
+        return not_modified
+    
+    query = task_list_query(db, project_id, project_ids, assignee, after)
+    tasks = query.offset(skip).limit(limit + 1).all()
+    
+    cursor = next_cursor(tasks, limit, lambda t: [t.status_id, t.order, t.id])
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return json_response(row_dicts(tasks), response)
+
+
+@router.patch("/reorder", response_model=List[TaskResponse])
+def reorder_tasks(moves: List[TaskMove], db: Session = Depends(get_db)):
+    """Apply drag-and-drop moves in one transaction and return only the changed tasks"""
+    if not moves:
+        return []
+    
+    # 同じタスクが複数回指定された場合は最後の移動を採用
+    moves_by_id = {move.id: move for move in moves}
+    
+    current = {row.id: row for row in db.query(Task.id, Task.order, Task.status, Task.status_id).filter(Task.id.in_(moves_by_id.keys()))}
+    missing_ids = sorted(set(moves_by_id) - set(current))
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {', '.join(str(i) for i in missing_ids)} not found"
+        )
+    
+    # ステータス名→共通ステータスIDはキャッシュからバッチ全体で1回だけ取得する
+    status_ids = status_registry.get_ids(db)
+    
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            changed = _apply_moves_from_values(db, moves_by_id.values(), status_ids)
+        else:
+            changed = _apply_moves_by_id(db, moves_by_id.values(), status_ids, current)
+        # コミットで属性が失効する前にレスポンスとイベントを作成する
+        result = [TaskResponse.model_validate(task) for task in changed]
+        publish_changes([task_event("updated", task) for task in changed], db)
+        db.commit()
+        return result
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot update task due to database constraints"
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
+    except Exception as e:
+        db.rollback()
+        raise
+
+
+def _apply_moves_from_values(db: Session, moves, status_ids) -> List[Task]:
+    """PostgreSQL: one UPDATE ... FROM (VALUES ...) RETURNING for the whole batch"""
+    moves_table = values(
+        column("id", Integer),
+        column("status", String),
+        column("status_id", Integer),
+        column("order", Float),
+        name="moves",
+    ).data([
+        (move.id, move.status, status_ids.get(move.status), move.order)
+        for move in moves
+    ])
+    new_status_id = cast(moves_table.c.status_id, Integer)
+    
+    # 値が変わる行だけを1回のUPDATE ... FROM (VALUES ...)で更新する
+    stmt = (
+        update(Task)
+        .where(Task.id == moves_table.c.id)
+        .where(or_(
+            Task.order.is_distinct_from(moves_table.c.order),
+            Task.status.is_distinct_from(moves_table.c.status),
+            Task.status_id.is_distinct_from(new_status_id),
+        ))
+        .values(order=moves_table.c.order, status=moves_table.c.status, status_id=new_status_id)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def _apply_moves_by_id(db: Session, moves, status_ids, current) -> List[Task]:
+    """Other databases (SQLite has no multi-row VALUES in UPDATE ... FROM): executemany UPDATE by primary key"""
+    # 値が変わる行だけを更新する（current は移動前の id, order, status, status_id）
+    rows = []
+    for move in moves:
+        new_values = (move.order, move.status, status_ids.get(move.status))
+        before = current[move.id]
+        if new_values != (before.order, before.status, before.status_id):
+            rows.append({"id": move.id, "order": move.order, "status": move.status, "status_id": new_values[2]})
+    if not rows:
+        return []
+    db.execute(update(Task), rows)
+    return db.query(Task).filter(Task.id.in_([row["id"] for row in rows])).order_by(Task.id).all()
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
@@ -87,19 +242,18 @@ def create_task(task: TaskCreate, db: Session = Depends(get_db)):
     
     # status_idが指定されていない場合、status名から共通ステータスIDを取得
     if task_dict.get("status_id") is None and task_dict.get("status"):
-        status_name = task_dict["status"]
-        
-        # 共通ステータスを取得（project_id IS NULL）
-        status = db.query(Status).filter(
-            Status.name == status_name,
-            Status.project_id.is_(None)
-        ).first()
-        if status:
-            task_dict["status_id"] = status.id
+        # 共通ステータスを取得（project_id IS NULL、キャッシュから取得）
+        task_dict["status_id"] = status_registry.get_id(db, task_dict["status"])
+    
+    # 順序が指定されていない場合は同じ列（プロジェクト×ステータス）の末尾に追加
+    if task_dict.get("order") is None:
+        task_dict["order"] = next_order(db, Task, task_column(task_dict["project_id"], task_dict["status_id"]))
     
     try:
         db_task = Task(**task_dict)
         db.add(db_task)
+        db.flush()
+        publish_changes([task_event("created", db_task)], db)
         db.commit()
         db.refresh(db_task)
         return db_task
@@ -131,23 +285,15 @@ def update_task(task_id: int, task_update: TaskUpdate, db: Session = Depends(get
     
     # status_idが更新される場合の処理
     if "status" in update_data:
-        status_name = update_data["status"]
-        
-        # 共通ステータスを取得（project_id IS NULL）
-        status = db.query(Status).filter(
-            Status.name == status_name,
-            Status.project_id.is_(None)
-        ).first()
-        if status:
-            update_data["status_id"] = status.id
-        else:
-            # ステータスが見つからない場合はNULL（個人タスクの場合など）
-            update_data["status_id"] = None
+        # 共通ステータスを取得（project_id IS NULL、キャッシュから取得）
+        # ステータスが見つからない場合はNULL（個人タスクの場合など）
+        update_data["status_id"] = status_registry.get_id(db, update_data["status"])
     
     try:
         for field, value in update_data.items():
             setattr(db_task, field, value)
         
+        publish_changes([task_event("updated", db_task)], db)
         db.commit()
         db.refresh(db_task)
         return db_task
@@ -168,6 +314,62 @@ def update_task(task_id: int, task_update: TaskUpdate, db: Session = Depends(get
         raise
 
 
+@router.put("/{task_id}/position", response_model=TaskResponse)
+def move_task(
+    task_id: int,
+    position: TaskPosition,
+    db: Session = Depends(get_db)
+):
+    """Move a task between two neighbours (only the moved task is written)"""
+    db_task = db.query(Task).filter(Task.id == task_id).first()
+    if db_task is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Task with id {task_id} not found")
+    
+    neighbour_ids = [i for i in (position.after_id, position.before_id) if i is not None]
+    neighbour_orders = dict(db.query(Task.id, Task.order).filter(Task.id.in_(neighbour_ids)).all()) if neighbour_ids else {}
+    for neighbour_id in neighbour_ids:
+        if neighbour_id not in neighbour_orders:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Task with id {neighbour_id} not found")
+    
+    if position.status is not None:
+        # 共通ステータスを取得（project_id IS NULL、キャッシュから取得）
+        db_task.status = position.status
+        db_task.status_id = status_registry.get_id(db, position.status)
+    
+    prev_order = neighbour_orders.get(position.after_id)
+    before_order = neighbour_orders.get(position.before_id)
+    if needs_rebalance(prev_order, before_order):
+        # 隣接要素の間に中間値を取れないため、挿入位置の前後だけを広げ直して配置する
+        db_task.order = respace_around(
+            db, Task, task_column(db_task.project_id, db_task.status_id),
+            (prev_order, position.after_id), (before_order, position.before_id), exclude_id=db_task.id
+        )
+    else:
+        db_task.order = rank_between(prev_order, before_order)
+    
+    try:
+        publish_changes([task_event("updated", db_task)], db)
+        db.commit()
+        db.refresh(db_task)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot update task due to database constraints"
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
+    except Exception as e:
+        db.rollback()
+        raise
+    
+    return db_task
+
+
 @router.delete("/{task_id}")
 def delete_task(task_id: int, db: Session = Depends(get_db)):
     """Delete a task"""
@@ -176,6 +378,7 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Task with id {task_id} not found")
     
     try:
+        publish_changes([task_event("deleted", db_task)], db)
         db.delete(db_task)
         db.commit()
         return {"message": "Task deleted successfully"}
@@ -219,6 +422,10 @@ def create_task_todo(task_id: int, todo: TodoCreate, db: Session = Depends(get_d
     todo_dict = todo.dict()
     todo_dict["task_id"] = task_id
     
+    # 順序が指定されていない場合はタスク内の末尾に追加
+    if todo_dict.get("order") is None:
+        todo_dict["order"] = next_order(db, Todo, todo_column(task_id))
+    
     # date型をdatetime型に変換
     if "scheduled_date" in todo_dict and todo_dict["scheduled_date"] is not None:
         if isinstance(todo_dict["scheduled_date"], date):
@@ -230,6 +437,8 @@ def create_task_todo(task_id: int, todo: TodoCreate, db: Session = Depends(get_d
     try:
         db_todo = Todo(**todo_dict)
         db.add(db_todo)
+        db.flush()
+        publish_changes([todo_event("created", db_todo.id, task_id, task.project_id, task.assignee)], db)
         db.commit()
         db.refresh(db_todo)
         return db_todo
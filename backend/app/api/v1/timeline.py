@@ -0,0 +1,120 @@
+"""
+Timeline API routes (Gantt chart)
+"""
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.query_budget import query_budget
+from app.core.etag import check_not_modified
+from app.core.versions import PROJECTS_SCOPE, TASKS_SCOPE, TODOS_SCOPE, get_versions
+from app.models import Project, ProjectAssignee, Task, Todo
+from app.models.models import PROJECT_MONTH_RANGE_SQL
+from app.schemas import TimelineResponse
+from app.schemas.project import MONTH_PATTERN
+
+router = APIRouter()
+
+
+def parse_month(value: str, name: str) -> date:
+    """First day of a "YYYY-MM" month (raises 400 if malformed)"""
+    if not MONTH_PATTERN.match(value):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name}: expected YYYY-MM")
+    year, month = value.split("-")
+    return date(int(year), int(month), 1)
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def month_overlap(db: Session, window_start: date, window_end: date):
+    """Projects whose [start_month, end_month] overlaps [window_start, window_end)"""
+    has_period = or_(Project.start_month.isnot(None), Project.end_month.isnot(None))
+    if db.get_bind().dialect.name == "postgresql":
+        # ix_projects_month_range（GiST）を使う範囲の重なり検索
+        overlaps = text(f"{PROJECT_MONTH_RANGE_SQL} && daterange(:window_start, :window_end)").bindparams(
+            window_start=window_start, window_end=window_end
+        )
+        return and_(has_period, overlaps)
+    return and_(
+        has_period,
+        or_(Project.start_month.is_(None), Project.start_month < window_end),
+        or_(Project.end_month.is_(None), Project.end_month >= window_start),
+    )
+
+
+@router.get("", response_model=TimelineResponse)
+@query_budget(2)
+def get_timeline(
+    request: Request,
+    response: Response,
+    from_month: str = Query(..., alias="from"),
+    to_month: str = Query(..., alias="to"),
+    assignee: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Projects overlapping the months from..to (inclusive) with their todo scheduled_date span in that window
+
+    A project is returned when its start_month..end_month overlaps the window or
+    when one of its todos is scheduled inside it; todo_start/todo_end/todo_count
+    are aggregated in SQL over the todos scheduled inside the window.
+    """
+    window_start = parse_month(from_month, "from")
+    window_end = next_month(parse_month(to_month, "to"))
+    if window_end <= window_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="to must not be before from")
+
+    not_modified = check_not_modified(request, response, get_versions(db, [PROJECTS_SCOPE, TASKS_SCOPE, TODOS_SCOPE]))
+    if not_modified:
+        return not_modified
+
+    # 表示範囲内のTODOをプロジェクトごとに集計（ix_todos_scheduled_date で範囲検索）
+    spans = db.query(
+        Task.project_id.label("project_id"),
+        func.min(Todo.scheduled_date).label("todo_start"),
+        func.max(Todo.scheduled_date).label("todo_end"),
+        func.count(Todo.id).label("todo_count"),
+    ).join(Task, Todo.task_id == Task.id).filter(
+        Todo.scheduled_date >= datetime.combine(window_start, datetime.min.time()),
+        Todo.scheduled_date < datetime.combine(window_end, datetime.min.time()),
+    ).group_by(Task.project_id).subquery()
+
+    def timeline_query():
+        query = db.query(
+            Project.id,
+            Project.name,
+            Project.start_month,
+            Project.end_month,
+            spans.c.todo_start,
+            spans.c.todo_end,
+            func.coalesce(spans.c.todo_count, 0).label("todo_count"),
+        ).filter(Project.id != -1)
+        if assignee:
+            query = query.filter(Project.assignee_rows.any(ProjectAssignee.assignee == assignee))
+        return query
+
+    # 期間が重なるプロジェクトと、範囲内にTODOがあるプロジェクトを1文で取得（UNIONで重複を除く）
+    by_period = timeline_query().outerjoin(spans, spans.c.project_id == Project.id).filter(
+        month_overlap(db, window_start, window_end)
+    )
+    by_todos = timeline_query().join(spans, spans.c.project_id == Project.id)
+    rows = by_period.union(by_todos).all()
+
+    projects = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "start_month": row.start_month,
+            "end_month": row.end_month,
+            "todo_start": row.todo_start,
+            "todo_end": row.todo_end,
+            "todo_count": row.todo_count,
+        }
+        for row in rows
+    ]
+    projects.sort(key=lambda p: (p["start_month"] or "9999-99", p["name"], p["id"]))
+    return {"from_month": from_month, "to_month": to_month, "projects": projects}
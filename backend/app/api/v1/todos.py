@@ -1,56 +1,285 @@
 """
 TODO API routes
 """
-from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, date, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy import case, func, nullslast, tuple_
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from app.core.database import get_db
+from app.core.query_budget import query_budget
+from app.core.grid import block_range, grid_column, grid_filters, grid_sort, group_key_condition
+from app.core.etag import check_not_modified
+from app.core.versions import TODOS_SCOPE, TASKS_SCOPE, PROJECTS_SCOPE, get_versions
+from app.core.pagination import decode_cursor, next_cursor
+from app.core.events import publish_changes, todo_event
+from app.core.ranking import rank_between, needs_rebalance, respace_around, todo_column
 from app.models import Task, Todo, Project
-from app.schemas import TodoUpdate, TodoResponse
+from app.schemas import TodoUpdate, TodoResponse, TodoPosition, GridRowsRequest, GridRowsResponse
 
 router = APIRouter()
 
 
+def _todo_event(action: str, todo: Todo) -> dict:
+    task = todo.task
+    return todo_event(action, todo.id, todo.task_id, task.project_id if task else None, task.assignee if task else None)
+
+
+PERSONAL_PROJECT_NAME = "個人タスク"
+
+# 個人タスク（project_id = -1）はプロジェクト行がないため名前をSQL側で補う
+project_name_column = case((Task.project_id == -1, PERSONAL_PROJECT_NAME), else_=Project.name)
+
+# sortで指定できるキー（一覧のJSONのキー名 -> 並び替えに使う列）
+TODO_SORT_COLUMNS = {
+    "id": Todo.id,
+    "order": Todo.order,
+    "title": Todo.title,
+    "completed": Todo.completed,
+    "scheduled_date": Todo.scheduled_date,
+    "completed_date": Todo.completed_date,
+    "created_at": Todo.created_at,
+    "updated_at": Todo.updated_at,
+    "task_name": Task.title,
+    "project_id": Task.project_id,
+    "project_name": project_name_column,
+}
+
+# グリッドでグループ化できる列
+TODO_GROUP_COLUMNS = ("project_name", "task_name")
+
+
+def todo_list_query(db: Session):
+    """Todos joined with their task title and project name (one row per todo, no lazy loads)"""
+    return db.query(
+        Todo.id,
+        Todo.task_id,
+        Todo.title,
+        Todo.completed,
+        Todo.order,
+        Todo.scheduled_date,
+        Todo.completed_date,
+        Todo.created_at,
+        Todo.updated_at,
+        Task.title.label("task_name"),
+        Task.project_id,
+        project_name_column.label("project_name"),
+    ).join(Task, Todo.task_id == Task.id).outerjoin(Project, Task.project_id == Project.id)
+
+
+def day_range(column, date_from: Optional[date], date_to: Optional[date]) -> list:
+    """Conditions for column within [date_from, date_to] (both inclusive, either may be None)"""
+    conditions = []
+    if date_from is not None:
+        conditions.append(column >= datetime.combine(date_from, datetime.min.time()))
+    if date_to is not None:
+        conditions.append(column < datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+    return conditions
+
+
+def contains(column, text: str):
+    """Case-insensitive substring match with LIKE wildcards in text escaped"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def parse_project_ids(project_ids: str) -> List[int]:
+    """Parse comma separated project ids (raises 400 if malformed)"""
+    try:
+        return [int(pid.strip()) for pid in project_ids.split(',') if pid.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid project_ids")
+
+
+def apply_todo_filters(
+    query,
+    completed: Optional[bool] = None,
+    scheduled_from: Optional[date] = None,
+    scheduled_to: Optional[date] = None,
+    completed_from: Optional[date] = None,
+    completed_to: Optional[date] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    q: Optional[str] = None,
+):
+    """Apply the todo list filters (all evaluated in SQL)"""
+    if completed is not None:
+        query = query.filter(Todo.completed.is_(completed))
+    conditions = day_range(Todo.scheduled_date, scheduled_from, scheduled_to)
+    conditions += day_range(Todo.completed_date, completed_from, completed_to)
+    if conditions:
+        query = query.filter(*conditions)
+    if project_ids:
+        query = query.filter(Task.project_id.in_(parse_project_ids(project_ids)))
+    if assignee:
+        query = query.filter(Task.assignee == assignee)
+    if q:
+        query = query.filter(contains(Todo.title, q))
+    return query
+
+
+def parse_todo_sort(sort: Optional[str]) -> list:
+    """Parse sort keys like "-scheduled_date,title" into ORDER BY clauses (id is always the last key)"""
+    if not sort:
+        return [Todo.order, Todo.id]
+    clauses = []
+    for key in (k.strip() for k in sort.split(",")):
+        if not key:
+            continue
+        column = TODO_SORT_COLUMNS.get(key.lstrip("-"))
+        if column is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sort key: {key} (allowed: {', '.join(TODO_SORT_COLUMNS)})"
+            )
+        clauses.append(nullslast(column.desc() if key.startswith("-") else column.asc()))
+    clauses.append(Todo.id)
+    return clauses
+
+
+def apply_todo_cursor(query, after: str):
+    """Restrict query to todos after the cursor in (order, id) order"""
+    order, todo_id = decode_cursor(after, 2)
+    return query.filter(tuple_(Todo.order, Todo.id) > tuple_(order, todo_id))
+
+
+def todo_page_query(filtered, after: Optional[str] = None, sort: Optional[str] = None):
+    """One page of the todo list: keyset predicate with `after`, otherwise the total as a window count"""
+    if after:
+        query = apply_todo_cursor(filtered, after)
+    else:
+        # 件数はウィンドウ関数で同じ文から取得する（別途COUNTを発行しない）
+        query = filtered.add_columns(func.count().over().label("total"))
+    return query.order_by(*parse_todo_sort(sort))
+
+
+def todo_list_item(row) -> dict:
+    """Serialize a row of todo_list_query"""
+    return {
+        "id": row.id,
+        "task_id": row.task_id,
+        "title": row.title,
+        "completed": row.completed,
+        "order": row.order,
+        "scheduled_date": row.scheduled_date.isoformat() if row.scheduled_date else None,
+        "completed_date": row.completed_date.isoformat() if row.completed_date else None,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        "task_name": row.task_name,
+        "project_id": row.project_id,
+        "project_name": row.project_name,
+    }
+
+
 @router.get("")
+@query_budget(3)
 def get_all_todos(
+    request: Request,
+    response: Response,
+    after: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    completed: Optional[bool] = None,
+    scheduled_from: Optional[date] = None,
+    scheduled_to: Optional[date] = None,
+    completed_from: Optional[date] = None,
+    completed_to: Optional[date] = None,
+    project_ids: Optional[str] = None,
+    assignee: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all todos with pagination"""
-    query = db.query(Todo).join(Task, Todo.task_id == Task.id).outerjoin(
-        Project, Task.project_id == Project.id
+    """Get todos with their task title and project name
+    
+    Filters: completed, scheduled_from/to and completed_from/to (inclusive dates),
+    project_ids (comma separated, -1 = personal tasks), assignee (task assignee) and
+    q (title substring). sort: comma separated keys, "-" prefix for descending.
+    Paging: skip/limit, or keyset paging with `after`=next_cursor (default sort only).
+    """
+    not_modified = check_not_modified(request, response, get_versions(db, [TODOS_SCOPE, TASKS_SCOPE, PROJECTS_SCOPE]))
+    if not_modified:
+        return not_modified
+    
+    if after and sort:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with sort")
+    
+    filtered = apply_todo_filters(
+        todo_list_query(db), completed, scheduled_from, scheduled_to,
+        completed_from, completed_to, project_ids, assignee, q
     )
     
-    total = query.count()
-    todos = query.order_by(Todo.order).offset(skip).limit(limit).all()
-    
-    result = []
-    for todo in todos:
-        task = todo.task
-        project = task.project if task and task.project_id != -1 else None
-        result.append({
-            "id": todo.id,
-            "task_id": todo.task_id,
-            "title": todo.title,
-            "completed": todo.completed,
-            "order": todo.order,
-            "scheduled_date": todo.scheduled_date.isoformat() if todo.scheduled_date else None,
-            "completed_date": todo.completed_date.isoformat() if todo.completed_date else None,
-            "created_at": todo.created_at.isoformat() if todo.created_at else None,
-            "updated_at": todo.updated_at.isoformat() if todo.updated_at else None,
-            "task_name": task.title if task else None,
-            "project_id": task.project_id if task else None,
-            "project_name": project.name if project else ("個人タスク" if task and task.project_id == -1 else None),
-        })
+    rows = todo_page_query(filtered, after, sort).offset(skip).limit(limit + 1).all()
+    if sort:
+        cursor = None
+        del rows[limit:]
+    else:
+        cursor = next_cursor(rows, limit, lambda r: [r.order, r.id])
+    
+    if rows and not after:
+        total = rows[0].total
+    else:
+        # カーソルページング・範囲外のページでは件数を別途数える
+        total = filtered.order_by(None).count()
     
     return {
-        "items": result,
+        "items": [todo_list_item(row) for row in rows],
         "total": total,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": cursor
+    }
+
+
+@router.post("/rows", response_model=GridRowsResponse)
+@query_budget(2)
+def get_todo_rows(grid: GridRowsRequest, db: Session = Depends(get_db)):
+    """Rows for the AG Grid infinite / server-side row model
+
+    Translates startRow/endRow, sortModel and filterModel to SQL over the
+    todo/task/project join. With rowGroupCols (project_name, task_name) the rows
+    of a group level are {<column>: key, childCount} until every level is
+    expanded by groupKeys. rowCount is the number of matching rows (or groups).
+    """
+    offset, limit = block_range(grid.startRow, grid.endRow)
+    for column in grid.rowGroupCols:
+        if column.id not in TODO_GROUP_COLUMNS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot group by {column.id} (allowed: {', '.join(TODO_GROUP_COLUMNS)})"
+            )
+    if len(grid.groupKeys) > len(grid.rowGroupCols):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="More groupKeys than rowGroupCols")
+    
+    filtered = todo_list_query(db).filter(*grid_filters(TODO_SORT_COLUMNS, grid.filterModel))
+    for column, key in zip(grid.rowGroupCols, grid.groupKeys):
+        filtered = filtered.filter(group_key_condition(TODO_SORT_COLUMNS[column.id], key))
+    
+    if len(grid.groupKeys) < len(grid.rowGroupCols):
+        # グループ階層: グループごとの件数を返す
+        col_id = grid.rowGroupCols[len(grid.groupKeys)].id
+        column = grid_column(TODO_SORT_COLUMNS, col_id)
+        direction = next((item.sort for item in grid.sortModel if item.colId == col_id), "asc")
+        groups = filtered.with_entities(column.label("key"), func.count().label("child_count")).group_by(column).subquery()
+        query = db.query(groups.c.key, groups.c.child_count, func.count().over().label("total")).order_by(
+            nullslast(groups.c.key.desc() if direction == "desc" else groups.c.key.asc())
+        )
+        rows = query.offset(offset).limit(limit).all()
+        total = rows[0].total if rows else db.query(func.count()).select_from(groups).scalar()
+        return {
+            "rows": [{col_id: row.key, "childCount": row.child_count} for row in rows],
+            "rowCount": total
+        }
+    
+    # 件数はウィンドウ関数で同じ文から取得する（範囲外のブロックのみ別途数える）
+    query = filtered.add_columns(func.count().over().label("total"))
+    rows = query.order_by(*grid_sort(TODO_SORT_COLUMNS, grid.sortModel), Todo.order, Todo.id).offset(offset).limit(limit).all()
+    total = rows[0].total if rows else filtered.order_by(None).count()
+    return {
+        "rows": [todo_list_item(row) for row in rows],
+        "rowCount": total
     }
 
 
@@ -82,6 +311,7 @@ def update_todo(todo_id: int, todo_update: TodoUpdate, db: Session = Depends(get
         for field, value in update_data.items():
             setattr(db_todo, field, value)
         
+        publish_changes([_todo_event("updated", db_todo)], db)
         db.commit()
         db.refresh(db_todo)
         return db_todo
@@ -102,6 +332,57 @@ def update_todo(todo_id: int, todo_update: TodoUpdate, db: Session = Depends(get
         raise
 
 
+@router.put("/{todo_id}/position", response_model=TodoResponse)
+def move_todo(
+    todo_id: int,
+    position: TodoPosition,
+    db: Session = Depends(get_db)
+):
+    """Move a todo between two neighbours (only the moved todo is written)"""
+    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
+    if db_todo is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Todo with id {todo_id} not found")
+    
+    neighbour_ids = [i for i in (position.after_id, position.before_id) if i is not None]
+    neighbour_orders = dict(db.query(Todo.id, Todo.order).filter(Todo.id.in_(neighbour_ids)).all()) if neighbour_ids else {}
+    for neighbour_id in neighbour_ids:
+        if neighbour_id not in neighbour_orders:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Todo with id {neighbour_id} not found")
+    
+    prev_order = neighbour_orders.get(position.after_id)
+    next_order = neighbour_orders.get(position.before_id)
+    if needs_rebalance(prev_order, next_order):
+        # 隣接要素の間に中間値を取れないため、挿入位置の前後だけを広げ直して配置する
+        db_todo.order = respace_around(
+            db, Todo, todo_column(db_todo.task_id),
+            (prev_order, position.after_id), (next_order, position.before_id), exclude_id=db_todo.id
+        )
+    else:
+        db_todo.order = rank_between(prev_order, next_order)
+    
+    try:
+        publish_changes([_todo_event("updated", db_todo)], db)
+        db.commit()
+        db.refresh(db_todo)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot update todo due to database constraints"
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
+    except Exception as e:
+        db.rollback()
+        raise
+    
+    return db_todo
+
+
 @router.delete("/{todo_id}")
 def delete_todo(todo_id: int, db: Session = Depends(get_db)):
     """Delete a todo"""
@@ -110,6 +391,7 @@ def delete_todo(todo_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Todo with id {todo_id} not found")
     
     try:
+        publish_changes([_todo_event("deleted", db_todo)], db)
         db.delete(db_todo)
         db.commit()
         return {"message": "Todo deleted successfully"}
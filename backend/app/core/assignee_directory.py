@@ -0,0 +1,71 @@
+"""
+In-process directory of assignees with task counts
+
+Assignees are collected with GROUP BY over tasks plus the project_assignees
+rows. Results are cached per project and reused while the "tasks" and
+"projects" data versions are unchanged, so any task or project write
+invalidates them in every worker.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, func, not_, or_
+from sqlalchemy.orm import Session
+
+from app.core.constants import CLOSED_STATUS_NAMES
+from app.models import ProjectAssignee, Task
+from app.schemas import AssigneeResponse
+
+GLOBAL_KEY = None
+
+
+class AssigneeDirectory:
+    """Per-process cache of distinct assignees (per project and global)"""
+
+    def __init__(self, max_entries: int = 1024):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Optional[int], Tuple[Tuple[int, ...], List[AssigneeResponse]]]" = OrderedDict()
+
+    def get(self, db: Session, project_id: Optional[int], versions: Tuple[int, ...]) -> List[AssigneeResponse]:
+        """Assignees of a project (or of all projects when project_id is None) for the given data versions"""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(project_id)
+                return list(entry[1])
+        
+        assignees = self._load(db, project_id)
+        with self._lock:
+            self._entries[project_id] = (versions, assignees)
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return list(assignees)
+
+    @staticmethod
+    def _load(db: Session, project_id: Optional[int]) -> List[AssigneeResponse]:
+        is_open = and_(
+            or_(Task.completed.is_(False), Task.completed.is_(None)),
+            not_(Task.status.in_(CLOSED_STATUS_NAMES)),
+        )
+        task_query = db.query(
+            Task.assignee,
+            func.count().label("tasks"),
+            func.count().filter(is_open).label("open_tasks"),
+        ).filter(Task.assignee.isnot(None), Task.assignee != "")
+        member_query = db.query(ProjectAssignee.assignee).distinct()
+        if project_id is not None:
+            task_query = task_query.filter(Task.project_id == project_id)
+            member_query = member_query.filter(ProjectAssignee.project_id == project_id)
+        
+        counts: Dict[str, AssigneeResponse] = {
+            name: AssigneeResponse(name=name, tasks=tasks, open_tasks=open_tasks)
+            for name, tasks, open_tasks in task_query.group_by(Task.assignee)
+        }
+        for (name,) in member_query:
+            counts.setdefault(name, AssigneeResponse(name=name))
+        return sorted(counts.values(), key=lambda assignee: assignee.name)
+
+
+assignee_directory = AssigneeDirectory()
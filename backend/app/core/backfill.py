@@ -0,0 +1,146 @@
+"""
+Batched backfills for migrations
+
+run_backfill() applies an UPDATE to one primary-key range at a time
+(BACKFILL_CHUNK_SIZE ids) and commits after each range, so row locks are held
+for one chunk only and WAL is written incrementally. The last finished id is
+stored in backfill_progress in the same transaction as the chunk, so a run that
+is interrupted resumes where it stopped. On PostgreSQL each chunk waits while
+replication lag or the number of sessions waiting on locks is above the
+configured limits, and a chunk that cannot get its row locks within
+BACKFILL_LOCK_TIMEOUT_MS is retried after a pause instead of queueing.
+
+A migration using it:
+    1. in its DDL transaction: add the column, then start_backfill(conn, name)
+    2. run_backfill(engine, name, table, set_sql, where_sql)
+    3. in a final transaction: add constraints, then finish_backfill(conn, name)
+and re-enters step 2 when backfill_pending() says an earlier run was cut off.
+"""
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+
+# スロットリングで1つの範囲を待たせる上限（秒、超えたら負荷に関わらず進める）
+MAX_THROTTLE_WAIT = 60.0
+# ロック待ちでタイムアウトした範囲をやり直す回数の上限
+MAX_LOCK_RETRIES = 10
+# 進捗を表示する間隔（秒）
+PROGRESS_INTERVAL = 5.0
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    name VARCHAR PRIMARY KEY,
+    last_id BIGINT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+LOAD_SQL = """
+SELECT
+    (SELECT COALESCE(EXTRACT(EPOCH FROM max(replay_lag)), 0) FROM pg_stat_replication) AS replication_lag,
+    (SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock' AND datname = current_database()) AS lock_waits
+"""
+
+
+def start_backfill(conn: Connection, name: str) -> None:
+    """Register a backfill (call in the same transaction as the DDL that makes it necessary)"""
+    if not backfill_pending(conn, name):
+        conn.execute(text("INSERT INTO backfill_progress (name) VALUES (:name)"), {"name": name})
+
+
+def backfill_pending(conn: Connection, name: str) -> bool:
+    """Whether a backfill was started and not finished (e.g. the previous run was interrupted)"""
+    conn.execute(text(CREATE_TABLE_SQL))
+    return conn.execute(
+        text("SELECT 1 FROM backfill_progress WHERE name = :name"), {"name": name}
+    ).fetchone() is not None
+
+
+def finish_backfill(conn: Connection, name: str) -> None:
+    """Forget a finished backfill (call in the transaction that adds the constraints relying on it)"""
+    conn.execute(text("DELETE FROM backfill_progress WHERE name = :name"), {"name": name})
+
+
+def _wait_for_capacity(conn: Connection, name: str) -> None:
+    """Sleep while replication lag or lock waits are above the limits (PostgreSQL only)"""
+    if conn.dialect.name != "postgresql":
+        return
+    waited, pause = 0.0, 0.5
+    while waited < MAX_THROTTLE_WAIT:
+        load = conn.execute(text(LOAD_SQL)).one()
+        conn.rollback()
+        if load.replication_lag <= settings.BACKFILL_MAX_REPLICATION_LAG and load.lock_waits <= settings.BACKFILL_MAX_LOCK_WAITS:
+            return
+        print(f"{name}: 負荷が高いため待機します（レプリケーション遅延 {load.replication_lag:.1f}秒、ロック待ち {load.lock_waits}件）")
+        time.sleep(pause)
+        waited += pause
+        pause = min(pause * 2, 10.0)
+
+
+def _is_lock_timeout(error: OperationalError) -> bool:
+    # 55P03: lock_not_available（lock_timeoutの超過）
+    return getattr(error.orig, "pgcode", None) == "55P03"
+
+
+def run_backfill(
+    engine: Engine,
+    name: str,
+    table: str,
+    set_sql: str,
+    where_sql: str = "TRUE",
+    params: Optional[dict] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """UPDATE table SET set_sql WHERE where_sql, one id range per transaction; returns the number of updated rows
+
+    Rows with an id above the maximum at the start are not visited, so the
+    application must already write the new value for rows it inserts.
+    """
+    chunk_size = chunk_size or settings.BACKFILL_CHUNK_SIZE
+    update_sql = text(f"UPDATE {table} SET {set_sql} WHERE id > :lo AND id <= :hi AND ({where_sql})")
+    save_sql = text("UPDATE backfill_progress SET last_id = :hi, updated_at = CURRENT_TIMESTAMP WHERE name = :name")
+
+    with engine.connect() as conn:
+        with conn.begin():
+            start_backfill(conn, name)
+            last_id = conn.execute(
+                text("SELECT last_id FROM backfill_progress WHERE name = :name"), {"name": name}
+            ).scalar()
+            min_id, max_id = conn.execute(text(f"SELECT min(id), max(id) FROM {table}")).one()
+        if max_id is None:
+            return 0
+        lo = last_id if last_id is not None else min_id - 1
+        if last_id is not None:
+            print(f"{name}: 前回の続き（id {last_id} より後）から再開します")
+
+        updated = 0
+        retries = 0
+        reported_at = time.monotonic()
+        while lo < max_id:
+            hi = min(lo + chunk_size, max_id)
+            _wait_for_capacity(conn, name)
+            try:
+                with conn.begin():
+                    if conn.dialect.name == "postgresql":
+                        conn.execute(text(f"SET LOCAL lock_timeout = {int(settings.BACKFILL_LOCK_TIMEOUT_MS)}"))
+                    updated += conn.execute(update_sql, {**(params or {}), "lo": lo, "hi": hi}).rowcount
+                    conn.execute(save_sql, {"hi": hi, "name": name})
+            except OperationalError as e:
+                if not _is_lock_timeout(e) or retries >= MAX_LOCK_RETRIES:
+                    raise
+                retries += 1
+                print(f"{name}: id {lo + 1}〜{hi} の行ロックを取得できないため再試行します（{retries}回目）")
+                time.sleep(min(2 ** retries * 0.1, 10.0))
+                continue
+            retries = 0
+            lo = hi
+            if time.monotonic() - reported_at >= PROGRESS_INTERVAL or lo >= max_id:
+                done = (lo - min_id + 1) / (max_id - min_id + 1) * 100
+                print(f"{name}: id {lo}/{max_id} まで完了（{done:.0f}%、{updated}行更新）")
+                reported_at = time.monotonic()
+        return updated
@@ -4,15 +4,67 @@ Application configuration
 import os
 from typing import List
 
+DEFAULT_DATABASE_URL = "postgresql://taskapp:taskapp_password@db:5432/taskapp_db"
+
 
 class Settings:
     """Application settings"""
     
     # Database
-    DATABASE_URL: str = os.getenv(
-        "DATABASE_URL", 
-        "postgresql://taskapp:taskapp_password@db:5432/taskapp_db"
-    )
+    DATABASE_URL: str = os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+    # データベースアクセス方式（sync: スレッドプール上の同期セッション、async: asyncpgによる非同期セッション）
+    DATABASE_MODE: str = os.getenv("DATABASE_MODE", "sync")
+    # 非同期モードの接続先（未指定の場合はDATABASE_URLのドライバをasyncpgに置き換える）
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    
+    # Connection pool
+    # ワーカーごとの常時保持する接続数と、それを超えて一時的に開ける接続数
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # 接続が空くまで待つ最大秒数（超えるとエラー）
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # 接続を作り直すまでの秒数（-1: 作り直さない）
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # 貸し出し前に接続の生存確認を行うか
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # SQL文の実行タイムアウト（ミリ秒、0: 無制限）
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # 接続待ち時間のパーセンタイル計算に使う直近の貸し出し数
+    DB_POOL_STATS_WINDOW: int = int(os.getenv("DB_POOL_STATS_WINDOW", "1000"))
+    
+    # Cache
+    # 共通ステータスのキャッシュが他ワーカーの更新を確認する間隔（秒）
+    STATUS_CACHE_CHECK_INTERVAL: float = float(os.getenv("STATUS_CACHE_CHECK_INTERVAL", "5"))
+    
+    # Change events
+    # リアルタイム変更通知の配信方式（memory: 単一プロセス、postgres: LISTEN/NOTIFYで複数ワーカー間に配信）
+    EVENT_BROKER: str = os.getenv("EVENT_BROKER", "memory")
+    
+    # Metrics
+    # /metrics（Prometheus形式）でルートごとのレイテンシ・DBクエリ数を計測するか
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    # ルートごとのクエリ予算（@query_budget）の確認方法（off / log: 超過とN+1の疑いをログ出力 / raise: 超過時に例外）
+    QUERY_BUDGET_MODE: str = os.getenv("QUERY_BUDGET_MODE", "off")
+    # 同じSQL文がこの回数以上繰り返されたらN+1の疑いとしてログ出力する（logモード）
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+    
+    # Task stats
+    # task_stats（ダッシュボード用のタスク件数集計表）をtasksから再集計してずれを直す間隔（秒、0: 実行しない）
+    TASK_STATS_RECONCILE_INTERVAL: float = float(os.getenv("TASK_STATS_RECONCILE_INTERVAL", "3600"))
+    
+    # Export
+    # エクスポート時にサーバーサイドカーソルから1回に読み出す行数（メモリ使用量はこの行数分で一定）
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    
+    # Backfill (migrations)
+    # マイグレーションでの一括更新を主キーの範囲で分割する際の1回あたりの範囲（この範囲ごとにコミット）
+    BACKFILL_CHUNK_SIZE: int = int(os.getenv("BACKFILL_CHUNK_SIZE", "5000"))
+    # レプリケーション遅延（秒）がこれを超えている間は次の範囲の更新を待つ
+    BACKFILL_MAX_REPLICATION_LAG: float = float(os.getenv("BACKFILL_MAX_REPLICATION_LAG", "10"))
+    # ロック待ちのセッション数がこれを超えている間は次の範囲の更新を待つ
+    BACKFILL_MAX_LOCK_WAITS: int = int(os.getenv("BACKFILL_MAX_LOCK_WAITS", "5"))
+    # 1回の更新でロックを待つ上限（ミリ秒、超えた場合は待ってから同じ範囲をやり直す）
+    BACKFILL_LOCK_TIMEOUT_MS: int = int(os.getenv("BACKFILL_LOCK_TIMEOUT_MS", "2000"))
     
     # CORS
     CORS_ORIGINS: List[str] = [
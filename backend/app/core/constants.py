@@ -2,6 +2,9 @@
 Application constants
 """
 
+# 完了扱いのステータス（担当者ごとの未完了タスク数から除外する）
+CLOSED_STATUS_NAMES = ["production_deployed", "cancelled"]
+
 # デフォルトステータス定義
 DEFAULT_STATUS_DEFINITIONS = [
     {"name": "considering", "display_name": "検討中", "order": 0, "color": "#9e9e9e"},
@@ -2,18 +2,90 @@
 Database configuration and session management
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from sqlalchemy.orm import Session, sessionmaker
+from typing import AsyncGenerator, Generator, Optional
 
 from app.core.config import settings
+from app.core.metrics import instrument_queries
+from app.core.pool_stats import PoolStats, instrument_engine, timed_pool_class
+from app.core.events import track_changes
+from app.core.versions import track_versions
 
-engine = create_engine(settings.DATABASE_URL)
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    """Engine keyword arguments for the configured pool (PostgreSQL only; other backends keep their defaults)"""
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    stats = PoolStats(window=settings.DB_POOL_STATS_WINDOW)
+    options = {
+        "poolclass": timed_pool_class(stats, is_async),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        # 接続ごとのセッション設定としてstatement_timeoutを渡す（ドライバで指定方法が異なる）
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options["connect_args"] = (
+            {"server_settings": {"statement_timeout": timeout}} if is_async
+            else {"options": f"-c statement_timeout={timeout}"}
+        )
+    return options
+
+
+def create_pooled_engine(name: str, url: str, is_async: bool = False):
+    """Create an engine with the configured pool and register it for pool statistics"""
+    options = pool_options(url, is_async)
+    created = create_async_engine(url, **options) if is_async else create_engine(url, **options)
+    if "poolclass" in options:
+        instrument_engine(name, created, options["poolclass"]._stats)
+    if settings.METRICS_ENABLED or settings.QUERY_BUDGET_MODE != "off":
+        instrument_queries(created)
+    return created
+
+
+engine = create_pooled_engine("sync", settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+track_versions(SessionLocal)
+track_changes(SessionLocal)
 
 Base = declarative_base()
 
 
+class AsyncBridgeSession(Session):
+    """Sync session driven by AsyncSession (lets the existing handlers run unchanged on asyncpg)"""
+
+
+track_versions(AsyncBridgeSession)
+track_changes(AsyncBridgeSession)
+
+# 非同期ドライバはDATABASE_MODE=asyncのときだけ読み込む
+async_engine = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def get_async_database_url() -> str:
+    """Async driver URL (postgresql -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite)"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+if settings.DATABASE_MODE == "async":
+    async_engine = create_pooled_engine("async", get_async_database_url(), is_async=True)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, sync_session_class=AsyncBridgeSession
+    )
+
+
 def get_db() -> Generator:
     """Dependency for getting database session"""
     db = SessionLocal()
@@ -23,6 +95,12 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
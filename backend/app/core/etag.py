@@ -0,0 +1,32 @@
+"""
+Conditional GET (ETag / If-None-Match) helpers
+"""
+import hashlib
+from typing import Dict, Optional
+from fastapi import Request, Response, status
+
+
+def make_etag(versions: Dict[str, int], request: Request) -> str:
+    """Build a strong ETag from data versions and the request's query string"""
+    key = ",".join(f"{scope}:{version}" for scope, version in sorted(versions.items()))
+    key += "|" + request.url.query
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Matchは弱い比較（W/プレフィックスを無視）
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def check_not_modified(request: Request, response: Response, versions: Dict[str, int]) -> Optional[Response]:
+    """Return a 304 response if the client's copy is current, otherwise set the ETag on response"""
+    etag = make_etag(versions, request)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,253 @@
+"""
+Change events for the real-time feed (/api/v1/stream)
+
+Handlers publish compact change events after committing. Subscribers are
+asyncio queues owned by the SSE connections. The fan-out backend is selected
+with EVENT_BROKER:
+
+- memory:   delivers to subscribers of this process only (single worker)
+- postgres: publishes with pg_notify and every process LISTENs, so events reach
+            subscribers on all uvicorn workers
+
+Handlers pass their session to publish_changes before committing: pg_notify
+runs in the request's own transaction (NOTIFY is sent on commit and dropped on
+rollback, and no second pooled connection is checked out), and the in-memory
+broker holds the events on the session until it commits.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event as orm_event, text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "taskapp_changes"
+# コミット待ちのイベントを保持する Session.info のキー
+_PENDING_KEY = "pending_change_events"
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+def task_event(action: str, task) -> Dict[str, Any]:
+    return {
+        "type": "task", "action": action, "id": task.id,
+        "project_id": task.project_id, "assignee": task.assignee, "status_id": task.status_id,
+    }
+
+
+def todo_event(action: str, todo_id: int, task_id: int, project_id: Optional[int], assignee: Optional[str]) -> Dict[str, Any]:
+    # project_id / assignee は親タスクの値（購読フィルタ用）
+    return {
+        "type": "todo", "action": action, "id": todo_id, "task_id": task_id,
+        "project_id": project_id, "assignee": assignee,
+    }
+
+
+def project_event(action: str, project_id: int) -> Dict[str, Any]:
+    return {"type": "project", "action": action, "id": project_id, "project_id": project_id}
+
+
+def status_event(action: str, status_id: int) -> Dict[str, Any]:
+    return {"type": "status", "action": action, "id": status_id}
+
+
+class Subscription:
+    """A subscriber's event queue with its project / assignee filter"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, project_ids: Optional[Set[int]], assignee: Optional[str]):
+        self.loop = loop
+        self.project_ids = project_ids
+        self.assignee = assignee
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        # ステータスなどプロジェクトに属さないイベントは全購読者に配信する
+        if self.project_ids is not None and event.get("project_id") is not None:
+            if event["project_id"] not in self.project_ids:
+                return False
+        if self.assignee and event.get("assignee") is not None and event["assignee"] != self.assignee:
+            return False
+        return True
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Put the event in the queue (must run on the subscriber's event loop)"""
+        if not self.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 追いつけない購読者には再同期を要求する
+            self.overflowed = True
+
+
+class InMemoryBroker:
+    """Fan-out to the subscribers of this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Set[Subscription] = set()
+
+    def subscribe(self, project_ids: Optional[Set[int]] = None, assignee: Optional[str] = None) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), project_ids, assignee)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def dispatch(self, events: List[Dict[str, Any]]) -> None:
+        """Deliver events to local subscribers (thread-safe)"""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            for event in events:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                except RuntimeError:
+                    # イベントループが終了している購読者
+                    self.unsubscribe(subscription)
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        self.dispatch(events)
+
+    def publish_in(self, session, events: List[Dict[str, Any]]) -> None:
+        """Publish when the session's transaction commits"""
+        # ロールバックで破棄できるよう、トランザクションに紐付ける
+        if not session.in_transaction():
+            session.begin()
+        session.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+class PostgresBroker(InMemoryBroker):
+    """Fan-out across processes with PostgreSQL LISTEN/NOTIFY"""
+
+    def __init__(self, engine):
+        super().__init__()
+        self._engine = engine
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self, project_ids: Optional[Set[int]] = None, assignee: Optional[str] = None) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe(project_ids, assignee)
+
+    @staticmethod
+    def _notify(conn, events: List[Dict[str, Any]]) -> None:
+        # NOTIFYはコミット時にまとめて送信される（自プロセスにもLISTEN経由で届く）
+        for event in events:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": json.dumps(event, ensure_ascii=False)}
+            )
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        with self._engine.begin() as conn:
+            self._notify(conn, events)
+
+    def publish_in(self, session, events: List[Dict[str, Any]]) -> None:
+        # リクエストのトランザクション内で送る（別の接続をプールから取らない）
+        self._notify(session, events)
+
+    def _ensure_listener(self) -> None:
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="event-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+        
+        dsn = self._engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            try:
+                conn = psycopg2.connect(dsn)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                logger.info("Listening for change events")
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    events = []
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        events.append(json.loads(notify.payload))
+                    if events:
+                        self.dispatch(events)
+            except Exception as e:
+                logger.error(f"Change event listener error (reconnecting): {e}")
+                time.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the configured event broker (created on first use)"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if settings.EVENT_BROKER == "postgres":
+                from app.core.database import engine
+                _broker = PostgresBroker(engine)
+            else:
+                _broker = InMemoryBroker()
+        return _broker
+
+
+def _publish(events: List[Dict[str, Any]]) -> None:
+    try:
+        get_broker().publish(events)
+    except Exception as e:
+        logger.error(f"Error publishing change events: {e}")
+
+
+def publish_changes(events: Iterable[Dict[str, Any]], db=None) -> None:
+    """Publish change events
+
+    With db (call before db.commit()), the events are sent with that session's
+    transaction: only if it commits, and on its own connection. Without db they
+    are sent right away on a separate connection; failures are logged, never
+    raised to the caller.
+    """
+    events = list(events)
+    if not events:
+        return
+    if db is not None:
+        get_broker().publish_in(db, events)
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        _publish(events)
+    else:
+        # イベントループ上ではpg_notifyの同期接続でループを止めないよう、スレッドプールで送信する
+        loop.run_in_executor(None, _publish, events)
+
+
+def track_changes(session_factory) -> None:
+    """Install session events that deliver the events queued with publish_changes(events, db) on commit"""
+
+    @orm_event.listens_for(session_factory, "after_commit")
+    def _after_commit(session):
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            _publish(pending)
+
+    @orm_event.listens_for(session_factory, "after_soft_rollback")
+    def _after_rollback(session, previous_transaction):
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,193 @@
+"""
+AG Grid row model requests translated to SQL
+
+The grid sends its sort model and filter model (text, number, date and set
+filters, optionally combined with AND/OR) keyed by column id. Routes map the
+column ids they expose to SQL expressions; anything else is rejected with 400
+so the request can never reference arbitrary columns.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Boolean, and_, false, func, not_, nullslast, or_, true
+
+# 1回のリクエストで返す最大行数（ブロックサイズの上限）
+MAX_BLOCK_SIZE = 1000
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def grid_column(columns: Dict[str, Any], col_id: str):
+    """SQL expression of a column id (raises 400 for columns the route does not expose)"""
+    column = columns.get(col_id)
+    if column is None:
+        raise _bad_request(f"Unknown column: {col_id} (allowed: {', '.join(columns)})")
+    return column
+
+
+def block_range(start_row: int, end_row: int):
+    """(offset, limit) of the requested block (limit is capped at MAX_BLOCK_SIZE)"""
+    if start_row < 0 or end_row < start_row:
+        raise _bad_request("Invalid startRow/endRow")
+    return start_row, min(end_row - start_row, MAX_BLOCK_SIZE)
+
+
+def _like(column, pattern: str, text: str):
+    escaped = str(text).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(pattern.replace("*", escaped), escape="\\")
+
+
+def _text_condition(column, kind: str, value):
+    if kind == "blank":
+        return or_(column.is_(None), column == "")
+    if kind == "notBlank":
+        return and_(column.isnot(None), column != "")
+    if value is None:
+        return None
+    if kind == "contains":
+        return _like(column, "%*%", value)
+    if kind == "notContains":
+        return or_(column.is_(None), not_(_like(column, "%*%", value)))
+    if kind == "equals":
+        return func.lower(column) == str(value).lower()
+    if kind == "notEqual":
+        return or_(column.is_(None), func.lower(column) != str(value).lower())
+    if kind == "startsWith":
+        return _like(column, "*%", value)
+    if kind == "endsWith":
+        return _like(column, "%*", value)
+    raise _bad_request(f"Unsupported text filter: {kind}")
+
+
+def _number_condition(column, kind: str, value, value_to):
+    if kind == "blank":
+        return column.is_(None)
+    if kind == "notBlank":
+        return column.isnot(None)
+    if value is None:
+        return None
+    if kind == "equals":
+        return column == value
+    if kind == "notEqual":
+        return or_(column.is_(None), column != value)
+    if kind == "lessThan":
+        return column < value
+    if kind == "lessThanOrEqual":
+        return column <= value
+    if kind == "greaterThan":
+        return column > value
+    if kind == "greaterThanOrEqual":
+        return column >= value
+    if kind == "inRange" and value_to is not None:
+        return and_(column >= value, column <= value_to)
+    raise _bad_request(f"Unsupported number filter: {kind}")
+
+
+def _parse_day(value: Optional[str]) -> Optional[datetime]:
+    """Midnight of a grid date value ("YYYY-MM-DD" or "YYYY-MM-DD hh:mm:ss")"""
+    if not value:
+        return None
+    try:
+        return datetime.combine(date.fromisoformat(str(value)[:10]), datetime.min.time())
+    except ValueError:
+        raise _bad_request(f"Invalid date: {value}")
+
+
+def _date_condition(column, kind: str, date_from: Optional[str], date_to: Optional[str]):
+    if kind == "blank":
+        return column.is_(None)
+    if kind == "notBlank":
+        return column.isnot(None)
+    day = _parse_day(date_from)
+    if day is None:
+        return None
+    # 日付の比較は日単位（時刻を持つ列でも同じ日なら一致とする）
+    next_day = day + timedelta(days=1)
+    if kind == "equals":
+        return and_(column >= day, column < next_day)
+    if kind == "notEqual":
+        return or_(column.is_(None), column < day, column >= next_day)
+    if kind == "lessThan":
+        return column < day
+    if kind == "greaterThan":
+        return column >= next_day
+    if kind == "inRange":
+        end = _parse_day(date_to)
+        if end is None:
+            return column >= day
+        return and_(column >= day, column < end + timedelta(days=1))
+    raise _bad_request(f"Unsupported date filter: {kind}")
+
+
+def _set_value(column, value):
+    if isinstance(column.type, Boolean) and isinstance(value, str):
+        return value.lower() == "true"
+    return value
+
+
+def _set_condition(column, values: List[Any]):
+    if not values:
+        # 何も選択されていないセットフィルタは1行も一致しない
+        return false()
+    present = [_set_value(column, v) for v in values if v is not None]
+    conditions = [column.in_(present)] if present else []
+    if len(present) < len(values):
+        conditions.append(column.is_(None))
+    return or_(*conditions)
+
+
+def _condition(column, model: Dict[str, Any]):
+    """SQL condition of one column filter (None when the filter has no value yet)"""
+    if not isinstance(model, dict):
+        raise _bad_request("Invalid filter model")
+    conditions = model.get("conditions")
+    if conditions is None and "condition1" in model:
+        # 旧形式（condition1 / condition2）
+        conditions = [c for c in (model.get("condition1"), model.get("condition2")) if c]
+    if conditions is not None:
+        clauses = [c for c in (_condition(column, sub) for sub in conditions) if c is not None]
+        if not clauses:
+            return None
+        return or_(*clauses) if model.get("operator") == "OR" else and_(*clauses)
+
+    filter_type = model.get("filterType", "text")
+    kind = model.get("type") or ("equals" if filter_type != "text" else "contains")
+    if filter_type == "text":
+        return _text_condition(column, kind, model.get("filter"))
+    if filter_type == "number":
+        return _number_condition(column, kind, model.get("filter"), model.get("filterTo"))
+    if filter_type == "date":
+        return _date_condition(column, kind, model.get("dateFrom"), model.get("dateTo"))
+    if filter_type == "set":
+        return _set_condition(column, model.get("values") or [])
+    raise _bad_request(f"Unsupported filter type: {filter_type}")
+
+
+def grid_filters(columns: Dict[str, Any], filter_model: Optional[Dict[str, Any]]) -> list:
+    """WHERE conditions for an AG Grid filter model"""
+    conditions = []
+    for col_id, model in (filter_model or {}).items():
+        condition = _condition(grid_column(columns, col_id), model)
+        if condition is not None:
+            conditions.append(condition)
+    return conditions
+
+
+def grid_sort(columns: Dict[str, Any], sort_model) -> list:
+    """ORDER BY clauses for an AG Grid sort model (NULLs last in both directions)"""
+    return [
+        nullslast(grid_column(columns, item.colId).desc() if item.sort == "desc" else grid_column(columns, item.colId).asc())
+        for item in sort_model
+    ]
+
+
+def group_key_condition(column, key: Optional[str]):
+    """Condition selecting the rows of an expanded group"""
+    if key is None:
+        return column.is_(None)
+    if isinstance(column.type, Boolean):
+        return column.is_(true() if str(key).lower() == "true" else false())
+    return column == key
@@ -0,0 +1,250 @@
+"""
+Request and database metrics (Prometheus text format)
+
+An ASGI middleware times every request and records its route, status and
+response size. SQLAlchemy cursor events count the statements each request
+executes and the time spent in them; the counts are kept per request in a
+context variable and folded into per-route histograms when the response ends.
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.pool_stats import get_pool_stats
+from app.core.query_budget import check_query_budget, report_query_budget, route_budget
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestMetrics:
+    """DB usage of the request being handled"""
+    queries: int = 0
+    db_time: float = 0.0
+    statements: Optional[Counter] = None  # SQL文ごとの実行回数（クエリ予算の確認時・キャプチャ中のみ）
+    scope: Optional[Dict[str, Any]] = None
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    """Metrics of the request being handled (None outside a request)"""
+    return _current.get()
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+
+    def observe(self, labels: Tuple[Tuple[str, str], ...], value: float) -> None:
+        # [bucket counts..., count, sum]
+        series = self._series.setdefault(labels, [0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+            lines.append(f"{self.name}_bucket{_labels(labels + (('le', '+Inf'),))} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_number(series[-1])}")
+        return lines
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """Per-process request and DB metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        self._latency = Histogram("http_request_duration_seconds", "Request latency by route", LATENCY_BUCKETS)
+        self._size = Histogram("http_response_size_bytes", "Response body size by route", SIZE_BUCKETS)
+        self._queries = Histogram("db_queries_per_request", "SQL statements executed per request", QUERY_COUNT_BUCKETS)
+        self._db_time = Histogram("db_time_per_request_seconds", "Time spent in SQL statements per request", LATENCY_BUCKETS)
+
+    def record_request(self, method: str, route: str, status_code: int, duration: float, size: int, db: RequestMetrics) -> None:
+        labels = (("method", method), ("route", route))
+        with self._lock:
+            key = labels + (("status", str(status_code)),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._latency.observe(labels, duration)
+            self._size.observe(labels, size)
+            self._queries.observe(labels, db.queries)
+            self._db_time.observe(labels, db.db_time)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = ["# HELP http_requests_total Requests by route and status", "# TYPE http_requests_total counter"]
+            lines += [f"http_requests_total{_labels(labels)} {count}" for labels, count in sorted(self._requests.items())]
+            for histogram in (self._latency, self._size, self._queries, self._db_time):
+                lines += histogram.render()
+        lines += _render_pool_stats()
+        return "\n".join(lines) + "\n"
+
+
+def _render_pool_stats() -> List[str]:
+    pools = get_pool_stats()
+    if not pools:
+        return []
+    gauges = [
+        ("db_pool_size", "gauge", "size", "Configured pool size"),
+        ("db_pool_checked_out", "gauge", "checked_out", "Connections checked out"),
+        ("db_pool_checked_in", "gauge", "checked_in", "Idle connections in the pool"),
+        ("db_pool_overflow", "gauge", "overflow", "Connections open beyond the pool size"),
+        ("db_pool_checkouts_total", "counter", "checkouts", "Connection checkouts"),
+        ("db_pool_waits_total", "counter", "waits", "Checkouts that found no idle connection"),
+        ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts that timed out"),
+    ]
+    lines = []
+    for name, kind, key, help_text in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{_labels([('engine', pool['engine'])])} {pool[key]}" for pool in pools]
+    lines += ["# HELP db_pool_wait_seconds Recent connection checkout wait times", "# TYPE db_pool_wait_seconds summary"]
+    for pool in pools:
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+            labels = [("engine", pool["engine"]), ("quantile", quantile)]
+            lines.append(f"db_pool_wait_seconds{_labels(labels)} {_number(pool['wait_ms'][key] / 1000)}")
+    return lines
+
+
+metrics_registry = MetricsRegistry()
+
+
+def instrument_queries(engine) -> None:
+    """Count statements and DB time of the current request (sync Engine or AsyncEngine)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        request = _current.get()
+        if request is not None:
+            request.queries += 1
+            request.db_time += time.perf_counter() - context._metrics_started
+            if request.statements is not None:
+                request.statements[statement] += 1
+                if request.scope is not None:
+                    check_query_budget(request.queries, request.statements, request.scope)
+
+
+@dataclass
+class CapturedRequest:
+    method: str
+    route: str
+    status_code: int
+    metrics: RequestMetrics
+    budget: Optional[int]  # ルートに宣言されたクエリ予算
+
+
+_capture_listeners: List[Callable[[CapturedRequest], None]] = []
+
+
+@contextmanager
+def capture_requests() -> Iterator[List[CapturedRequest]]:
+    """Collect the route and DB usage of every request finished inside the block (used by tests)"""
+    captured: List[CapturedRequest] = []
+    listener = captured.append
+    _capture_listeners.append(listener)
+    try:
+        yield captured
+    finally:
+        _capture_listeners.remove(listener)
+
+
+_route_paths: Dict[object, str] = {}
+
+
+def _route_path(scope) -> str:
+    """Path template of the matched route (e.g. /api/v1/tasks/{task_id})"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+    if endpoint not in _route_paths:
+        for route in app.router.routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                _route_paths[endpoint] = route.path
+                break
+        else:
+            return UNMATCHED_ROUTE
+    return _route_paths[endpoint]
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, response size and DB usage per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics()
+        if settings.QUERY_BUDGET_MODE != "off" or _capture_listeners:
+            request.statements = Counter()
+            request.scope = scope
+        token = _current.set(request)
+        started = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = _route_path(scope)
+            metrics_registry.record_request(
+                scope["method"], route, status_code, time.perf_counter() - started, size, request
+            )
+            if request.statements is not None:
+                report_query_budget(request.queries, request.statements, scope)
+                for listener in list(_capture_listeners):
+                    listener(CapturedRequest(scope["method"], route, status_code, request, route_budget(scope)))
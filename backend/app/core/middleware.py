@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
 
 
 def setup_cors(app: FastAPI):
@@ -14,7 +15,7 @@ def setup_cors(app: FastAPI):
             CORSMiddleware,
             allow_origins=["*"],
             allow_credentials=False,
-            allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
             allow_headers=["*"],
             expose_headers=["*"],
         )
@@ -23,7 +24,13 @@ def setup_cors(app: FastAPI):
             CORSMiddleware,
             allow_origins=settings.CORS_ORIGINS,
             allow_credentials=True,
-            allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
             allow_headers=["*"],
             expose_headers=["*"],
         )
+
+
+def setup_metrics(app: FastAPI):
+    """Setup request/DB metrics middleware (exposed at /metrics, also checks query budgets)"""
+    if settings.METRICS_ENABLED or settings.QUERY_BUDGET_MODE != "off":
+        app.add_middleware(MetricsMiddleware)
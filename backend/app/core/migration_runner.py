@@ -0,0 +1,160 @@
+"""
+Versioned migration runner
+
+Each entry in MIGRATIONS names a module in app/migrations and is applied once,
+in list order, then recorded in the schema_migrations table. On startup a single
+SELECT on schema_migrations tells whether anything is pending; an up-to-date
+database needs nothing else. Otherwise the worker takes a PostgreSQL advisory
+lock (other workers wait on it and then find nothing left to do), creates
+missing tables from the models and applies the pending migrations.
+
+A database that has tables but no schema_migrations was created before this
+runner and already went through the baseline migrations (they ran on every
+start), so they are recorded as applied without running them. A brand-new
+database runs them after create_all like any other pending migration; they are
+no-ops on the model schema except for the data they seed (e.g. the personal
+task project id=-1).
+
+To add a migration, append it to MIGRATIONS; never reorder or rename entries
+that may already be recorded.
+"""
+import importlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.database import Base
+import app.models  # noqa: F401  テーブル定義をBase.metadataに登録する
+
+# 複数ワーカーのマイグレーションを1つに絞るためのアドバイザリロックのキー
+MIGRATION_LOCK_KEY = 7_401_002
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str  # app.migrations 配下のモジュール名（schema_migrations.version に記録）
+    label: str  # ログ表示用
+    dialects: Tuple[str, ...] = ("postgresql",)  # 対象外のデータベースでは実行せずに適用済みとして記録
+    baseline: bool = False  # schema_migrations導入前から毎回実行されていたもの（導入時に適用済みとして記録）
+
+
+MIGRATIONS: List[Migration] = [
+    Migration("migrate_add_status_id", "status_idカラム追加", baseline=True),
+    Migration("migrate_add_order", "orderカラム追加", baseline=True),
+    Migration("migrate_add_project", "プロジェクト追加", baseline=True),
+    Migration("migrate_add_project_fields", "プロジェクトフィールド追加", baseline=True),
+    Migration("migrate_add_task_assignee", "タスク担当者追加", baseline=True),
+    Migration("migrate_add_personal_task_support", "個人タスクサポート", ("postgresql", "sqlite"), baseline=True),
+    Migration("migrate_update_statuses", "ステータス更新", baseline=True),
+    Migration("migrate_add_todos", "todosテーブル作成", baseline=True),
+    Migration("migrate_add_todo_dates", "TODO日付カラム追加", baseline=True),
+    Migration("migrate_common_statuses", "ステータス共通化", baseline=True),
+    Migration("migrate_add_indexes", "複合インデックス追加"),
+    Migration("migrate_fractional_order", "分数順序"),
+    Migration("migrate_project_assignees", "プロジェクト担当者移行"),
+    Migration("migrate_project_months", "プロジェクト期間の型変換"),
+    Migration("migrate_task_stats", "タスク集計表"),
+    Migration("migrate_search_indexes", "検索インデックス", ("postgresql", "sqlite")),
+    Migration("migrate_version_shards", "データバージョンの分散", ("postgresql", "sqlite")),
+]
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR PRIMARY KEY,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def applied_versions(engine: Engine) -> Optional[Set[str]]:
+    """Versions recorded in schema_migrations (None if the table does not exist yet)"""
+    try:
+        with engine.connect() as conn:
+            return {row.version for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+    except DBAPIError:
+        return None
+
+
+def pending_migrations(applied: Set[str]) -> List[Migration]:
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Hold the migration advisory lock (PostgreSQL only; blocks until other workers release it)"""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        # セッション単位のロックはコミット後も保持される（idle in transactionにしない）
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+
+
+def _record(engine: Engine, version: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": version})
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Apply pending migrations; returns the versions recorded by this call
+
+    A failing migration is not recorded and the error is raised, so the worker
+    does not start on a partly migrated schema; the migration is retried on the
+    next start. Each migration commits its own work before it is recorded, so
+    migrations must stay idempotent.
+    """
+    applied = applied_versions(engine)
+    if applied is not None and not pending_migrations(applied):
+        return []
+
+    with migration_lock(engine):
+        # ロック待ちの間に他のワーカーが適用した分を除く
+        applied = applied_versions(engine)
+        if applied is None:
+            # schema_migrations導入前から使われているデータベースでは、既存のマイグレーションを適用済みとして記録する
+            # （再実行すると migrate_common_statuses がステータスを削除し直すなど、既存のデータを壊すため）
+            # 新規のデータベースでは記録せず、create_all の後に実行する（個人タスク用プロジェクトなどの初期データを作るため）
+            legacy = inspect(engine).has_table("tasks")
+            baseline = [migration.version for migration in MIGRATIONS if migration.baseline] if legacy else []
+            with engine.begin() as conn:
+                conn.execute(text(CREATE_TABLE_SQL))
+                for version in baseline:
+                    conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": version})
+            applied = set(baseline)
+        pending = pending_migrations(applied)
+        if not pending:
+            return []
+
+        # マイグレーションはテーブルが存在する前提のため、先にモデルから作成する
+        Base.metadata.create_all(bind=engine)
+
+        recorded = []
+        for migration in pending:
+            if engine.dialect.name in migration.dialects:
+                try:
+                    importlib.import_module(f"app.migrations.{migration.version}").migrate()
+                except Exception as e:
+                    print(f"マイグレーションエラー（{migration.label}）: {e}")
+                    if recorded:
+                        print(f"適用済みのマイグレーション: {', '.join(recorded)}")
+                    raise
+            _record(engine, migration.version)
+            recorded.append(migration.version)
+        print(f"マイグレーションを適用しました: {', '.join(recorded)}")
+        return recorded
+
+
+if __name__ == "__main__":
+    from app.core.database import engine
+
+    run_migrations(engine)
@@ -0,0 +1,39 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+from fastapi import HTTPException, status
+
+
+def encode_cursor(keys: List[Any]) -> str:
+    """Encode sort key values of the last row into an opaque cursor string"""
+    raw = json.dumps(keys, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """Decode a cursor created by encode_cursor (raises 400 if it is malformed)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        keys = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        keys = None
+    
+    if not isinstance(keys, list) or len(keys) != length or not all(k is None or isinstance(k, (int, float)) for k in keys):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return keys
+
+
+def next_cursor(rows: List[Any], limit: int, key) -> Optional[str]:
+    """Return the cursor for the page after rows (None when rows is the last page)
+
+    rows must be fetched with limit + 1 so that the existence of a next page can be
+    detected without an extra query; the surplus row is removed from rows in place.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(key(rows[-1]))
@@ -0,0 +1,150 @@
+"""
+Connection pool statistics
+
+The pools used by the engines time how long each checkout waited for a free
+connection; pool events then feed the checkout/checkin counters and a window
+of recent wait times, so the pool can be sized for the number of workers.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+_WAIT_KEY = "pool_wait"
+
+
+class PoolStats:
+    """Counters and wait-time window for one engine's pool"""
+
+    def __init__(self, window: int):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.checkins = 0
+        self.waits = 0  # 空き接続がなく待たされた貸し出し数
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_checkout(self, wait: float, waited: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits += waited
+            self._waits.append(wait)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def wait_percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99/max of the recent checkout waits in milliseconds"""
+        with self._lock:
+            ordered = sorted(self._waits)
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        pick = lambda p: ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1] * 1000}
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # overflow()は pool_size を超えて開いている接続数（空きがあると負の値になる）
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            **counters,
+            "wait_ms": self.wait_percentiles(),
+        }
+
+
+class _TimedCheckoutMixin:
+    """Times the wait for a connection and hands it to the checkout event via the record's info"""
+
+    _stats = None
+
+    def _do_get(self):
+        saturated = self.checkedin() == 0 and 0 <= self._max_overflow <= self.overflow()
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            if self._stats is not None:
+                self._stats.record_timeout()
+            raise
+        record.info[_WAIT_KEY] = (time.perf_counter() - started, saturated)
+        return record
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_engines: Dict[str, Any] = {}
+
+
+def timed_pool_class(stats: PoolStats, is_async: bool = False) -> type:
+    """Pool class bound to a PoolStats (a class attribute survives pool.recreate())"""
+    base = TimedAsyncQueuePool if is_async else TimedQueuePool
+    return type(base.__name__, (base,), {"_stats": stats})
+
+
+def instrument_engine(name: str, engine, stats: PoolStats) -> None:
+    """Attach pool event listeners to an engine (sync Engine or AsyncEngine)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    _engines[name] = (sync_engine, stats)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        wait, saturated = connection_record.info.pop(_WAIT_KEY, (0.0, False))
+        stats.record_checkout(wait, saturated)
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.record_checkin()
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.record_connect()
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.record_invalidation()
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """Current statistics of every instrumented engine's pool"""
+    return [
+        {"engine": name, **stats.snapshot(sync_engine.pool)}
+        for name, (sync_engine, stats) in _engines.items()
+        if isinstance(sync_engine.pool, QueuePool)
+    ]
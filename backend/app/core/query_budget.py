@@ -0,0 +1,73 @@
+"""
+Per-request SQL query budgets (N+1 detection)
+
+Routes declare how many statements one request may execute with
+@query_budget(n). With QUERY_BUDGET_MODE=log the metrics middleware logs
+requests that exceed their budget or repeat the same statement many times;
+with QUERY_BUDGET_MODE=raise the statement that goes over the budget raises
+QueryBudgetExceeded. Statements are grouped by their SQL text, which already
+has the parameters bound separately, so an N+1 loop shows up as one statement
+repeated N times.
+"""
+import logging
+from collections import Counter
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_BUDGET_ATTR = "query_budget"
+
+
+class QueryBudgetExceeded(Exception):
+    """A request executed more SQL statements than its route allows"""
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare the maximum number of SQL statements a route may execute per request"""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, _BUDGET_ATTR, max_queries)
+        return endpoint
+    return decorator
+
+
+def route_budget(scope) -> Optional[int]:
+    """Budget declared on the matched route's endpoint (None if the route declares none)"""
+    return getattr(scope.get("endpoint"), _BUDGET_ATTR, None)
+
+
+def format_statements(statements: Counter, limit: int = 5) -> str:
+    """Most repeated statements, one per line with their count"""
+    return "\n".join(
+        f"  {count}x {' '.join(statement.split())[:200]}"
+        for statement, count in statements.most_common(limit)
+    )
+
+
+def check_query_budget(queries: int, statements: Counter, scope) -> None:
+    """Raise as soon as a request goes over its budget (QUERY_BUDGET_MODE=raise)"""
+    if settings.QUERY_BUDGET_MODE != "raise":
+        return
+    budget = route_budget(scope)
+    if budget is not None and queries > budget:
+        raise QueryBudgetExceeded(
+            f"{scope['method']} {scope['path']} executed more than {budget} queries:\n{format_statements(statements)}"
+        )
+
+
+def report_query_budget(queries: int, statements: Counter, scope) -> None:
+    """Log requests over their budget or repeating a statement (QUERY_BUDGET_MODE=log)"""
+    if settings.QUERY_BUDGET_MODE != "log" or not statements:
+        return
+    budget = route_budget(scope)
+    if budget is not None and queries > budget:
+        logger.warning(
+            f"{scope['method']} {scope['path']} executed {queries} queries (budget {budget}):\n{format_statements(statements)}"
+        )
+        return
+    statement, count = statements.most_common(1)[0]
+    if count >= settings.QUERY_REPEAT_THRESHOLD:
+        logger.warning(
+            f"{scope['method']} {scope['path']} repeated a statement {count} times (possible N+1):\n{format_statements(statements)}"
+        )
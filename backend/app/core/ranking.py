@@ -0,0 +1,132 @@
+"""
+Fractional ranking for Task.order / Todo.order
+
+Moving an item only rewrites that item's order (the midpoint between its new
+neighbours). When the neighbours are too close for another midpoint in double
+precision, only a bounded window of items on either side of the gap is spread
+out again (RESPACE_WINDOW per side, widened only while the window itself has no
+room), so a move never renumbers a whole column. New items are appended after
+the last item of their column.
+
+A task column is (project_id, status_id); a todo column is the todos of one task.
+"""
+from typing import Optional
+from sqlalchemy import select, update, func, tuple_
+
+from app.models import Task, Todo
+
+# 再配置時・末尾追加時の間隔（中間値の挿入を繰り返すと約30回でMIN_RANK_GAPを下回る）
+RANK_STEP = 1024.0
+# 隣接要素の間隔がこれより狭い場合は先に周辺を再配置する
+MIN_RANK_GAP = 1e-6
+# 再配置する範囲（挿入位置の前後それぞれの件数）
+RESPACE_WINDOW = 8
+
+
+def rank_between(prev_order: Optional[float], next_order: Optional[float]) -> float:
+    """Return an order value between the previous and the next item (None = column edge)"""
+    if prev_order is None and next_order is None:
+        return 0.0
+    if prev_order is None:
+        return next_order - RANK_STEP
+    if next_order is None:
+        return prev_order + RANK_STEP
+    return (prev_order + next_order) / 2
+
+
+def needs_rebalance(prev_order: Optional[float], next_order: Optional[float]) -> bool:
+    """Whether the neighbours are too close (or equal) for a midpoint between them"""
+    if prev_order is None or next_order is None:
+        return False
+    return next_order - prev_order < 2 * MIN_RANK_GAP
+
+
+def task_column(project_id: int, status_id: Optional[int]):
+    """Filter for the tasks sharing a board column"""
+    status_filter = Task.status_id.is_(None) if status_id is None else Task.status_id == status_id
+    return (Task.project_id == project_id) & status_filter
+
+
+def todo_column(task_id: int):
+    """Filter for the todos of a task"""
+    return Todo.task_id == task_id
+
+
+def next_order(db, model, scope) -> float:
+    """Order value that appends an item after the last one in the column"""
+    last = db.execute(select(func.max(model.order)).where(scope)).scalar()
+    return RANK_STEP if last is None else last + RANK_STEP
+
+
+def append_orders(db, model, columns, items) -> None:
+    """Give items (dicts) without an order increasing positions after the last item of their column
+
+    columns are the model attributes identifying a column, e.g. (Task.project_id, Task.status_id);
+    the current last orders are read with one grouped query.
+    """
+    pending = [item for item in items if item.get("order") is None]
+    if not pending:
+        return
+    names = [column.key for column in columns]
+    # 先頭の列で絞り込み、列ごとの最大値をまとめて取得する（status_idがNULLの列も含めるため）
+    rows = db.execute(
+        select(*columns, func.max(model.order))
+        .where(columns[0].in_({item[names[0]] for item in pending}))
+        .group_by(*columns)
+    ).all()
+    last_orders = {tuple(row[:-1]): row[-1] for row in rows}
+    for item in pending:
+        key = tuple(item[name] for name in names)
+        last = last_orders.get(key)
+        item["order"] = RANK_STEP if last is None else last + RANK_STEP
+        last_orders[key] = item["order"]
+
+
+def respace_around(db, model, scope, after, before, exclude_id: Optional[int] = None) -> float:
+    """Spread out the items around a too narrow gap and return the order for the item placed in it
+
+    after / before are the (order, id) of the neighbours. Up to RESPACE_WINDOW items on
+    each side (neighbours included) are spaced evenly between the items just outside
+    the window; the window is widened only when that range has no room. Runs in the
+    caller's transaction. exclude_id leaves the item being moved out.
+    """
+    if exclude_id is not None:
+        scope = scope & (model.id != exclude_id)
+    window = RESPACE_WINDOW
+    while True:
+        below = db.execute(
+            select(model.id, model.order).where(scope, tuple_(model.order, model.id) <= tuple_(*after))
+            .order_by(model.order.desc(), model.id.desc()).limit(window + 1)
+        ).all()
+        above = db.execute(
+            select(model.id, model.order).where(scope, tuple_(model.order, model.id) >= tuple_(*before))
+            .order_by(model.order, model.id).limit(window + 1)
+        ).all()
+        # 範囲外の最も近い要素（None = 列の端まで含まれている）
+        lower = below[window].order if len(below) > window else None
+        upper = above[window].order if len(above) > window else None
+        # None は移動する要素の位置
+        ids = [row.id for row in reversed(below[:window])] + [None] + [row.id for row in above[:window]]
+        
+        if lower is not None and upper is not None:
+            step = (upper - lower) / (len(ids) + 1)
+            if step < MIN_RANK_GAP:
+                window *= 2
+                continue
+            start = lower + step
+        else:
+            step = RANK_STEP
+            if lower is not None:
+                start = lower + step
+            elif upper is not None:
+                start = upper - step * len(ids)
+            else:
+                start = step
+        break
+    
+    orders = [start + step * i for i in range(len(ids))]
+    db.execute(
+        update(model),
+        [{"id": item_id, "order": order} for item_id, order in zip(ids, orders) if item_id is not None]
+    )
+    return orders[ids.index(None)]
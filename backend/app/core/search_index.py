@@ -0,0 +1,60 @@
+"""
+Search indexes over task titles/descriptions and todo titles
+
+PostgreSQL: pg_trgm GIN indexes, which serve ILIKE '%...%' for any language
+(Japanese has no word boundaries, so tsvector tokenizing does not fit) and
+provide word_similarity() for ranking.
+SQLite: FTS5 tables with the trigram tokenizer, kept in sync by triggers.
+"""
+from sqlalchemy import column, table, text
+
+# (インデックス名, テーブル, カラム)
+TRGM_INDEXES = [
+    ("ix_tasks_title_trgm", "tasks", "title"),
+    ("ix_tasks_description_trgm", "tasks", "description"),
+    ("ix_todos_title_trgm", "todos", "title"),
+]
+
+# FTS5の外部コンテンツテーブル（rowid = 元テーブルのid）
+tasks_fts = table("tasks_fts", column("rowid"), column("title"), column("description"))
+todos_fts = table("todos_fts", column("rowid"), column("title"))
+
+SQLITE_FTS_TABLES = {
+    "tasks_fts": ("tasks", ["title", "description"]),
+    "todos_fts": ("todos", ["title"]),
+}
+
+
+def _sqlite_fts_ddl(fts: str, source: str, columns: list) -> list:
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{source}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {source} BEGIN {delete} {insert} END",
+    ]
+
+
+def install_search_index(conn) -> None:
+    """Create the search indexes for the connection's database (idempotent)"""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for name, table_name, column_name in TRGM_INDEXES:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} USING gin ({column_name} gin_trgm_ops)"
+            ))
+    elif dialect == "sqlite":
+        for fts, (source, columns) in SQLITE_FTS_TABLES.items():
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+            ).fetchone()
+            for statement in _sqlite_fts_ddl(fts, source, columns):
+                conn.execute(text(statement))
+            if exists is None:
+                # 既存の行を取り込む
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
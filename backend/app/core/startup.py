@@ -1,76 +1,14 @@
 """
 Application startup events
 """
-from app.core.database import init_db
 
 
 def run_migrations():
-    """Run database migrations"""
-    import sys
-    import os
-    # マイグレーションファイルはbackendディレクトリ直下にあるため、パスを追加
-    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    sys.path.insert(0, backend_dir)
+    """Apply pending database migrations (creates missing tables first; no-op when up to date)"""
+    from app.core.database import engine
+    from app.core.migration_runner import run_migrations as run_pending_migrations
     
-    try:
-        from app.migrations.migrate_add_status_id import migrate
-        migrate()
-    except Exception as e:
-        print(f"マイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_order import migrate as migrate_order
-        migrate_order()
-    except Exception as e:
-        print(f"マイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_project import migrate as migrate_project
-        migrate_project()
-    except Exception as e:
-        print(f"プロジェクトマイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_project_fields import migrate as migrate_project_fields
-        migrate_project_fields()
-    except Exception as e:
-        print(f"プロジェクトフィールドマイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_task_assignee import migrate as migrate_task_assignee
-        migrate_task_assignee()
-    except Exception as e:
-        print(f"タスク担当者マイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_personal_task_support import migrate as migrate_personal_task
-        migrate_personal_task()
-    except Exception as e:
-        print(f"個人タスクサポートマイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_update_statuses import migrate as migrate_update_statuses
-        migrate_update_statuses()
-    except Exception as e:
-        print(f"ステータス更新マイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_todos import migrate as migrate_add_todos
-        migrate_add_todos()
-    except Exception as e:
-        print(f"todosテーブル作成マイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_add_todo_dates import migrate as migrate_add_todo_dates
-        migrate_add_todo_dates()
-    except Exception as e:
-        print(f"TODO日付カラム追加マイグレーションエラー（無視可能）: {e}")
-    
-    try:
-        from app.migrations.migrate_common_statuses import migrate as migrate_common_statuses
-        migrate_common_statuses()
-    except Exception as e:
-        print(f"ステータス共通化マイグレーションエラー（無視可能）: {e}")
+    run_pending_migrations(engine)
 
 
 def initialize_default_statuses():
@@ -103,8 +41,31 @@ def initialize_default_statuses():
         db.close()
 
 
+def load_status_registry():
+    """Load common statuses into the in-process status registry"""
+    from app.core.database import SessionLocal
+    from app.core.status_registry import status_registry
+    
+    db = SessionLocal()
+    try:
+        status_registry.get_statuses(db)
+    except Exception as e:
+        print(f"ステータスキャッシュ読み込みエラー（無視可能）: {e}")
+    finally:
+        db.close()
+
+
+def start_background_jobs():
+    """Start periodic maintenance jobs of this worker"""
+    from app.core.database import engine
+    from app.core.task_stats import start_reconciler
+    
+    start_reconciler(engine)
+
+
 def startup_event():
     """Application startup event"""
-    init_db()
     run_migrations()
     initialize_default_statuses()
+    load_status_registry()
+    start_background_jobs()
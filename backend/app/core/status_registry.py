@@ -0,0 +1,104 @@
+"""
+In-process registry of the common statuses
+
+Keeps name -> id and the ordered status list in memory so that task writes do
+not query the statuses table. Status writes bump the "statuses" data version;
+each worker re-checks that version at most every STATUS_CACHE_CHECK_INTERVAL
+seconds and reloads when it changed.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import DEFAULT_STATUS_DEFINITIONS
+from app.core.responses import dumps
+from app.core.versions import STATUSES_SCOPE, get_version
+from app.models import Status
+from app.schemas import StatusResponse
+
+
+class StatusRegistry:
+    """Per-process cache of the common statuses (project_id IS NULL)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._statuses: List[StatusResponse] = []
+        self._statuses_json = b"[]"
+        self._ids_by_name: Dict[str, int] = {}
+
+    def _is_fresh(self) -> bool:
+        return self._version is not None and time.monotonic() - self._checked_at < settings.STATUS_CACHE_CHECK_INTERVAL
+
+    def _refresh(self, db: Session) -> None:
+        if self._is_fresh():
+            return
+        # クエリはロックの外で実行する（DATABASE_MODE=async ではイベントループのスレッドで実行されるため、
+        # I/O待ちの間にロックを持ったままだと、同じスレッドでロックを待つ別のリクエストがループごと止めてしまう）
+        # バージョンを先に読む（古いデータに新しいバージョンを付けないため）
+        version = get_version(db, STATUSES_SCOPE)
+        loaded = None
+        if version != self._version:
+            statuses = db.query(Status).filter(Status.project_id.is_(None)).order_by(Status.order).all()
+            responses = [StatusResponse.model_validate(s) for s in statuses] or self._default_statuses()
+            # 一覧のレスポンスはバージョンが変わるまで同じなので、JSONも1回だけ作る
+            loaded = ({s.name: s.id for s in statuses}, responses, dumps([s.model_dump() for s in responses]))
+        with self._lock:
+            # 同時に読み込んだ場合は新しいバージョンを残す
+            if loaded is not None and (self._version is None or version >= self._version):
+                self._ids_by_name, self._statuses, self._statuses_json = loaded
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _default_statuses() -> List[StatusResponse]:
+        # 共通ステータスが存在しない場合は、デフォルトステータスを返す（マイグレーション前の互換性のため）
+        return [
+            StatusResponse(
+                id=idx,
+                name=status["name"],
+                display_name=status["display_name"],
+                order=status["order"],
+                color=status["color"],
+                project_id=None,
+                created_at=datetime.now()
+            )
+            for idx, status in enumerate(DEFAULT_STATUS_DEFINITIONS)
+        ]
+
+    def get_statuses(self, db: Session) -> List[StatusResponse]:
+        """Common statuses ordered by display order"""
+        self._refresh(db)
+        return list(self._statuses)
+
+    def get_statuses_json(self, db: Session) -> bytes:
+        """Common statuses as a rendered JSON array (same content as get_statuses)"""
+        self._refresh(db)
+        return self._statuses_json
+
+    def get_id(self, db: Session, name: str) -> Optional[int]:
+        """Common status id for a status name (None if there is no such status)"""
+        self._refresh(db)
+        return self._ids_by_name.get(name)
+
+    def get_ids(self, db: Session) -> Dict[str, int]:
+        """Mapping of common status name -> id"""
+        self._refresh(db)
+        return dict(self._ids_by_name)
+
+    def get_version(self, db: Session) -> int:
+        """Data version the cached statuses were loaded at"""
+        self._refresh(db)
+        return self._version
+
+    def invalidate(self) -> None:
+        """Force a reload on next access (call after committing a status change)"""
+        with self._lock:
+            self._version = None
+
+
+status_registry = StatusRegistry()
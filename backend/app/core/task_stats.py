@@ -0,0 +1,175 @@
+"""
+Task count summary table (task_stats)
+
+On PostgreSQL, statement-level triggers on tasks add each statement's net
+change per (project_id, status_id, assignee) to task_stats in the same
+transaction, so the dashboard reads a table whose size depends on the number
+of project/status/assignee combinations rather than on the number of tasks.
+reconcile_task_stats() compares the table with tasks and adds the difference
+(e.g. after TRUNCATE or manual SQL) without blocking task writes; a background
+thread runs it every TASK_STATS_RECONCILE_INTERVAL seconds. Other databases
+aggregate tasks directly.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.versions import TASKS_SCOPE, bump_version
+from app.models import Task, TaskStat
+
+logger = logging.getLogger(__name__)
+
+# 複数ワーカーの再集計を1つに絞るためのアドバイザリロックのキー
+RECONCILE_LOCK_KEY = 7_401_001
+
+# 行の集計キー（NULLは主キーに使えないため 0 / 空文字で表す）
+_KEY_COLUMNS = "project_id, COALESCE(status_id, 0), COALESCE(assignee, '')"
+
+TRIGGER_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_stats (project_id, status_id, assignee, count)
+        SELECT {_KEY_COLUMNS}, count(*) FROM new_rows
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        ON CONFLICT (project_id, status_id, assignee) DO UPDATE SET count = task_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_stats (project_id, status_id, assignee, count)
+        SELECT {_KEY_COLUMNS}, -count(*) FROM old_rows
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        ON CONFLICT (project_id, status_id, assignee) DO UPDATE SET count = task_stats.count + EXCLUDED.count;
+    ELSE
+        -- 並び替えなど集計キーが変わらない更新は差分が0になり何も書かない
+        INSERT INTO task_stats (project_id, status_id, assignee, count)
+        SELECT project_id, status_id, assignee, sum(delta) FROM (
+            SELECT {_KEY_COLUMNS}, -1 FROM old_rows
+            UNION ALL
+            SELECT {_KEY_COLUMNS}, 1 FROM new_rows
+        ) AS changes (project_id, status_id, assignee, delta)
+        GROUP BY 1, 2, 3 HAVING sum(delta) <> 0 ORDER BY 1, 2, 3
+        ON CONFLICT (project_id, status_id, assignee) DO UPDATE SET count = task_stats.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS task_stats_insert ON tasks",
+    "DROP TRIGGER IF EXISTS task_stats_update ON tasks",
+    "DROP TRIGGER IF EXISTS task_stats_delete ON tasks",
+    """
+    CREATE TRIGGER task_stats_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()
+    """,
+    """
+    CREATE TRIGGER task_stats_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()
+    """,
+    """
+    CREATE TRIGGER task_stats_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()
+    """,
+]
+
+# 集計表とtasksを同じスナップショットで比べ、ずれだけを差分として加える
+# （トリガーはtasksと同じトランザクションで集計表を更新するため、スナップショット上では両者は一致するはずで、
+#   その後にコミットされた変更の差分は加算なので打ち消さない。テーブルロックは取らず、修正する行だけを行ロックする）
+RECONCILE_SQL = f"""
+WITH actual (project_id, status_id, assignee, count) AS (
+    SELECT {_KEY_COLUMNS}, count(*) FROM tasks GROUP BY 1, 2, 3
+),
+drift (project_id, status_id, assignee, delta) AS (
+    SELECT
+        COALESCE(a.project_id, s.project_id),
+        COALESCE(a.status_id, s.status_id),
+        COALESCE(a.assignee, s.assignee),
+        COALESCE(a.count, 0) - COALESCE(s.count, 0)
+    FROM actual a
+    FULL JOIN task_stats s
+        ON a.project_id = s.project_id AND a.status_id = s.status_id AND a.assignee = s.assignee
+    WHERE COALESCE(a.count, 0) <> COALESCE(s.count, 0)
+),
+fixed AS (
+    INSERT INTO task_stats (project_id, status_id, assignee, count)
+    SELECT project_id, status_id, assignee, delta FROM drift ORDER BY 1, 2, 3
+    ON CONFLICT (project_id, status_id, assignee) DO UPDATE SET count = task_stats.count + EXCLUDED.count
+    RETURNING 1
+)
+SELECT count(*) FROM fixed
+"""
+
+# 件数が0になった行を片付ける（トリガーが同時に更新中の行は行ロックを待ってから再評価される）
+CLEANUP_SQL = "DELETE FROM task_stats WHERE count = 0"
+
+
+def is_maintained(db) -> bool:
+    """Whether task_stats is kept up to date by triggers (PostgreSQL only)"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def install_triggers(conn) -> None:
+    """Create (or replace) the trigger function and the triggers on tasks"""
+    conn.execute(text(TRIGGER_FUNCTION_SQL))
+    for statement in TRIGGERS_SQL:
+        conn.execute(text(statement))
+
+
+def reconcile_task_stats(conn) -> Optional[int]:
+    """Correct task_stats from tasks; returns the number of corrected rows (None if another worker is running it)"""
+    # 複数のワーカーが同じずれを二重に加えないよう、アドバイザリロックで1つに絞る
+    if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}).scalar():
+        return None
+    corrected = conn.execute(text(RECONCILE_SQL)).scalar()
+    conn.execute(text(CLEANUP_SQL))
+    if corrected:
+        bump_version(conn, TASKS_SCOPE)
+    return corrected
+
+
+def task_stats_query(db: Session):
+    """(project_id, status_id, assignee, count) rows with a non-zero count"""
+    if is_maintained(db):
+        return db.query(TaskStat.project_id, TaskStat.status_id, TaskStat.assignee, TaskStat.count).filter(
+            TaskStat.count > 0
+        )
+    status_id = func.coalesce(Task.status_id, 0)
+    assignee = func.coalesce(Task.assignee, "")
+    return db.query(
+        Task.project_id, status_id.label("status_id"), assignee.label("assignee"), func.count().label("count")
+    ).group_by(Task.project_id, status_id, assignee)
+
+
+def _reconcile_loop(engine, interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            with engine.begin() as conn:
+                corrected = reconcile_task_stats(conn)
+            if corrected:
+                logger.warning(f"task_stats drift corrected ({corrected} rows)")
+        except Exception as e:
+            logger.error(f"task_stats reconcile error: {e}")
+
+
+_reconciler: Optional[threading.Thread] = None
+
+
+def start_reconciler(engine) -> None:
+    """Run reconcile_task_stats every TASK_STATS_RECONCILE_INTERVAL seconds in a daemon thread"""
+    global _reconciler
+    interval = settings.TASK_STATS_RECONCILE_INTERVAL
+    if interval <= 0 or engine.dialect.name != "postgresql" or _reconciler is not None:
+        return
+    _reconciler = threading.Thread(
+        target=_reconcile_loop, args=(engine, interval), name="task-stats-reconciler", daemon=True
+    )
+    _reconciler.start()
@@ -0,0 +1,91 @@
+"""
+Data version counters (incremented in the same transaction as the data they guard)
+
+Every ORM write to a tracked table bumps the version of that table once per
+transaction, so list endpoints can tell whether anything changed with a single
+primary-key range lookup on data_versions.
+
+A scope's version is spread over VERSION_SHARDS rows and each bump increments
+a random one, so concurrent writers to the same table rarely wait on each
+other's row lock until commit. The version is the sum of the rows; it still
+grows by exactly one per committed bump.
+"""
+import random
+from typing import Dict, Iterable
+from sqlalchemy import bindparam, event, text
+
+STATUSES_SCOPE = "statuses"
+TASKS_SCOPE = "tasks"
+TODOS_SCOPE = "todos"
+PROJECTS_SCOPE = "projects"
+
+# バージョンを管理するテーブル（テーブル名 = スコープ名）
+TRACKED_TABLES = {STATUSES_SCOPE, TASKS_SCOPE, TODOS_SCOPE, PROJECTS_SCOPE}
+# 子テーブルへの書き込みは親のスコープとして数える
+TABLE_SCOPES = {"project_assignees": PROJECTS_SCOPE}
+
+# 1つのスコープのバージョンを分ける行数
+VERSION_SHARDS = 16
+
+_BUMPED_KEY = "bumped_version_scopes"
+
+
+def bump_version(conn, scope: str) -> None:
+    """Increment the version of a scope (conn may be a Session or a Connection)"""
+    conn.execute(text("""
+        INSERT INTO data_versions (scope, shard, version) VALUES (:scope, :shard, 1)
+        ON CONFLICT (scope, shard) DO UPDATE SET version = data_versions.version + 1
+    """), {"scope": scope, "shard": random.randrange(VERSION_SHARDS)})
+
+
+def get_version(conn, scope: str) -> int:
+    """Return the current version of a scope (0 if it has never been bumped)"""
+    version = conn.execute(
+        text("SELECT sum(version) FROM data_versions WHERE scope = :scope"), {"scope": scope}
+    ).scalar()
+    return version or 0
+
+
+def get_versions(conn, scopes: Iterable[str]) -> Dict[str, int]:
+    """Return the current versions of several scopes in one query"""
+    scopes = sorted(set(scopes))
+    rows = conn.execute(
+        text("SELECT scope, sum(version) FROM data_versions WHERE scope IN :scopes GROUP BY scope").bindparams(
+            bindparam("scopes", expanding=True)
+        ),
+        {"scopes": scopes}
+    ).all()
+    versions = {scope: 0 for scope in scopes}
+    versions.update({scope: version for scope, version in rows})
+    return versions
+
+
+def _bump_tables(session, tables: Iterable[str]) -> None:
+    # 同じトランザクション内では各スコープにつき1回だけ加算する
+    bumped = session.info.setdefault(_BUMPED_KEY, set())
+    scopes = {TABLE_SCOPES.get(table_name, table_name) for table_name in tables}
+    for table_name in sorted(scopes & TRACKED_TABLES - bumped):
+        bump_version(session.connection(), table_name)
+        bumped.add(table_name)
+
+
+def track_versions(session_factory) -> None:
+    """Install session events that bump data versions on writes to tracked tables"""
+
+    @event.listens_for(session_factory, "after_flush")
+    def _after_flush(session, flush_context):
+        changed = list(session.new) + list(session.dirty) + list(session.deleted)
+        _bump_tables(session, (obj.__table__.name for obj in changed if hasattr(obj, "__table__")))
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state):
+        # update()/insert()/delete()による一括書き込み（flushを経由しない）
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None:
+                _bump_tables(orm_execute_state.session, [mapper.local_table.name])
+
+    @event.listens_for(session_factory, "after_transaction_end")
+    def _after_transaction_end(session, transaction):
+        if transaction.parent is None:
+            session.info.pop(_BUMPED_KEY, None)
@@ -2,9 +2,11 @@
 FastAPI application entry point
 """
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
-from app.core.middleware import setup_cors
+from app.core.middleware import setup_cors, setup_metrics
+from app.core.metrics import metrics_registry
 from app.core.exceptions import (
     validation_exception_handler,
     global_exception_handler
@@ -17,6 +19,7 @@ app = FastAPI(title="Task Management API")
 
 # Setup middleware
 setup_cors(app)
+setup_metrics(app)
 
 # Setup exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -34,3 +37,9 @@ def on_startup():
 @app.get("/")
 def read_root():
     return {"message": "Task Management API"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """Per-route request/DB metrics and pool statistics in Prometheus text format"""
+    return metrics_registry.render()
@@ -0,0 +1,56 @@
+"""
+ボード表示・TODO取得・ステータス検索で使われる絞り込み/並び替え用の複合インデックスを追加するマイグレーション
+大きなテーブルへの書き込みをブロックしないよう CREATE INDEX CONCURRENTLY で作成する
+"""
+from sqlalchemy import text
+from app.core.database import engine
+
+# (インデックス名, CREATE文) ※モデルの__table_args__と同じ定義にすること
+INDEXES = [
+    ("ix_tasks_project_status_order",
+     'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_project_status_order ON tasks (project_id, status_id, "order", id)'),
+    ("ix_tasks_assignee_project",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_assignee_project ON tasks (assignee, project_id)"),
+    ("ix_tasks_personal_assignee",
+     'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_personal_assignee ON tasks (assignee, status_id, "order") WHERE project_id = -1'),
+    ("ix_tasks_status_order_id",
+     'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_status_order_id ON tasks (status_id, "order", id)'),
+    ("ix_todos_task_order",
+     'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_task_order ON todos (task_id, "order")'),
+    ("ix_todos_order_id",
+     'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_todos_order_id ON todos ("order", id)'),
+    ("ix_statuses_common_name",
+     'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_statuses_common_name ON statuses (name, "order") WHERE project_id IS NULL'),
+]
+
+# 新しい複合インデックスの先頭列と重複するため不要になったインデックス
+REDUNDANT_INDEXES = ["idx_todos_task_id"]
+
+def migrate():
+    # CONCURRENTLYはトランザクション内で実行できないためAUTOCOMMITで接続する
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            for index_name, create_sql in INDEXES:
+                # 中断されたCONCURRENTLY作成で残った無効なインデックスは作り直す
+                invalid = conn.execute(text("""
+                    SELECT 1
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = :index_name AND NOT i.indisvalid
+                """), {"index_name": index_name}).fetchone()
+                if invalid is not None:
+                    print(f"無効なインデックス {index_name} を削除しています...")
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+                
+                conn.execute(text(create_sql))
+            
+            for index_name in REDUNDANT_INDEXES:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+            
+            print("複合インデックスの作成が完了しました")
+        except Exception as e:
+            print(f"複合インデックス追加マイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
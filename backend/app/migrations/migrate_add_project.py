@@ -1,14 +1,11 @@
 """
 既存のデータベースにprojectsテーブルを追加し、tasksとstatusesにproject_idを追加するマイグレーションスクリプト
 """
-from sqlalchemy import create_engine, text
-import os
-
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://taskapp:taskapp_password@db:5432/taskapp_db")
+from sqlalchemy import text
+from app.core.database import engine
+from app.core.backfill import backfill_pending, finish_backfill, run_backfill, start_backfill
 
 def migrate():
-    engine = create_engine(DATABASE_URL)
-    
     with engine.connect() as conn:
         trans = conn.begin()
         try:
@@ -60,7 +57,7 @@ def migrate():
                     default_project_id = result.fetchone()[0]
                     print(f"デフォルトプロジェクトを作成しました (ID: {default_project_id})")
             
-            # statusesテーブルにproject_idカラムを追加
+            # statusesテーブルにproject_idカラムを追加（値の設定は後で範囲ごとに分けて行う）
             result = conn.execute(text("""
                 SELECT column_name 
                 FROM information_schema.columns 
@@ -73,14 +70,41 @@ def migrate():
                     ALTER TABLE statuses 
                     ADD COLUMN project_id INTEGER
                 """))
-                
-                # 既存のstatusesにデフォルトプロジェクトIDを設定
+                start_backfill(conn, "statuses.project_id")
+            
+            # tasksテーブルにproject_idカラムを追加
+            result = conn.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name='tasks' AND column_name='project_id'
+            """))
+            
+            if result.fetchone() is None:
+                print("tasksテーブルにproject_idカラムを追加しています...")
                 conn.execute(text("""
-                    UPDATE statuses 
-                    SET project_id = :project_id
-                    WHERE project_id IS NULL
-                """), {"project_id": default_project_id})
-                
+                    ALTER TABLE tasks 
+                    ADD COLUMN project_id INTEGER
+                """))
+                start_backfill(conn, "tasks.project_id")
+            
+            statuses_pending = backfill_pending(conn, "statuses.project_id")
+            tasks_pending = backfill_pending(conn, "tasks.project_id")
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"エラーが発生しました: {e}")
+            raise
+    
+    # 既存の行にデフォルトプロジェクトIDを設定し、終わってから制約を追加する
+    # （中断した場合は次回の実行時に続きから再開する）
+    if statuses_pending:
+        run_backfill(
+            engine, "statuses.project_id", "statuses",
+            "project_id = :project_id", "project_id IS NULL", {"project_id": default_project_id},
+        )
+        with engine.connect() as conn:
+            trans = conn.begin()
+            try:
                 # NOT NULL制約を追加
                 conn.execute(text("""
                     ALTER TABLE statuses 
@@ -113,28 +137,22 @@ def migrate():
                     """))
                 except Exception as e:
                     print(f"ユニークインデックスの作成をスキップ（既に存在する可能性）: {e}")
-            
-            # tasksテーブルにproject_idカラムを追加
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name='tasks' AND column_name='project_id'
-            """))
-            
-            if result.fetchone() is None:
-                print("tasksテーブルにproject_idカラムを追加しています...")
-                conn.execute(text("""
-                    ALTER TABLE tasks 
-                    ADD COLUMN project_id INTEGER
-                """))
-                
-                # 既存のtasksにデフォルトプロジェクトIDを設定
-                conn.execute(text("""
-                    UPDATE tasks 
-                    SET project_id = :project_id
-                    WHERE project_id IS NULL
-                """), {"project_id": default_project_id})
                 
+                finish_backfill(conn, "statuses.project_id")
+                trans.commit()
+            except Exception as e:
+                trans.rollback()
+                print(f"エラーが発生しました: {e}")
+                raise
+    
+    if tasks_pending:
+        run_backfill(
+            engine, "tasks.project_id", "tasks",
+            "project_id = :project_id", "project_id IS NULL", {"project_id": default_project_id},
+        )
+        with engine.connect() as conn:
+            trans = conn.begin()
+            try:
                 # NOT NULL制約を追加
                 conn.execute(text("""
                     ALTER TABLE tasks 
@@ -150,13 +168,15 @@ def migrate():
                     """))
                 except Exception as e:
                     print(f"外部キー制約の追加をスキップ（既に存在する可能性）: {e}")
-            
-            trans.commit()
-            print("マイグレーションが完了しました！")
-        except Exception as e:
-            trans.rollback()
-            print(f"エラーが発生しました: {e}")
-            raise
+                
+                finish_backfill(conn, "tasks.project_id")
+                trans.commit()
+            except Exception as e:
+                trans.rollback()
+                print(f"エラーが発生しました: {e}")
+                raise
+    
+    print("マイグレーションが完了しました！")
 
 if __name__ == "__main__":
     migrate()
@@ -1,14 +1,10 @@
 """
 既存のデータベースにstatus_idカラムを追加するマイグレーションスクリプト
 """
-from sqlalchemy import create_engine, text
-import os
-
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://taskapp:taskapp_password@db:5432/taskapp_db")
+from sqlalchemy import text
+from app.core.database import engine
 
 def migrate():
-    engine = create_engine(DATABASE_URL)
-    
     with engine.connect() as conn:
         trans = conn.begin()
         try:
@@ -2,82 +2,103 @@
 ステータスを共通化するマイグレーション
 すべてのプロジェクト・個人タスクで共通の7種類のステータスのみを使用するように変更
 """
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from app.core.database import engine
+from app.core.backfill import backfill_pending, finish_backfill, run_backfill, start_backfill
 from app.core.constants import DEFAULT_STATUS_DEFINITIONS
+from app.core.versions import STATUSES_SCOPE, TASKS_SCOPE, bump_version
+
+BACKFILL_NAME = "tasks.status_id(common_statuses)"
+
+# 共通ステータス（名前ごとに最小のIDを使用する。これ以外のステータスは付け替え完了後に削除）
+COMMON_STATUS_IDS_SQL = """
+    SELECT min(id) FROM statuses
+    WHERE project_id IS NULL AND name IN :names
+    GROUP BY name
+"""
+
+def _with_names(sql: str):
+    return text(sql).bindparams(
+        bindparam("names", value=[d["name"] for d in DEFAULT_STATUS_DEFINITIONS], expanding=True)
+    )
 
 def migrate():
     with engine.connect() as conn:
         trans = conn.begin()
         try:
-            # 1. 既存のタスクのstatus_idとstatus名のマッピングを取得
-            tasks_result = conn.execute(text("""
-                SELECT DISTINCT t.id, t.status_id, t.status, t.project_id
-                FROM tasks t
-                WHERE t.status_id IS NOT NULL
-            """))
-            tasks = tasks_result.fetchall()
-            
-            # 2. 既存のすべてのステータスを削除
-            conn.execute(text("DELETE FROM statuses"))
-            
-            # 3. project_idをnullable=Trueに変更（既にNULLを許可する場合はスキップ）
-            try:
-                conn.execute(text("ALTER TABLE statuses ALTER COLUMN project_id DROP NOT NULL"))
-            except Exception as e:
-                # 既にnullableの場合はスキップ
-                print(f"project_idカラムの変更をスキップ（既にnullableの可能性）: {e}")
-            
-            # 4. 共通の7つのステータスを作成（project_id=NULL）
-            status_id_map = {}  # 古いstatus_id -> 新しいstatus_idのマッピング
-            for idx, status_data in enumerate(DEFAULT_STATUS_DEFINITIONS):
-                result = conn.execute(text("""
-                    INSERT INTO statuses (name, display_name, "order", color, project_id, created_at)
-                    VALUES (:name, :display_name, :order, :color, NULL, NOW())
-                    RETURNING id
-                """), {
-                    "name": status_data["name"],
-                    "display_name": status_data["display_name"],
-                    "order": status_data["order"],
-                    "color": status_data["color"]
-                })
-                new_status_id = result.fetchone()[0]
+            if backfill_pending(conn, BACKFILL_NAME):
+                # 前回の実行で共通ステータスの作成は完了しているため、タスクの付け替えだけを再開する
+                print("ステータス共通化: タスクのstatus_idの更新を再開します")
+            else:
+                # 1. project_idをnullable=Trueに変更（既にNULLを許可する場合はスキップ）
+                try:
+                    with conn.begin_nested():
+                        conn.execute(text("ALTER TABLE statuses ALTER COLUMN project_id DROP NOT NULL"))
+                except Exception as e:
+                    # 既にnullableの場合はスキップ
+                    print(f"project_idカラムの変更をスキップ（既にnullableの可能性）: {e}")
                 
-                # status名から新しいIDへのマッピングを作成
-                status_id_map[status_data["name"]] = new_status_id
-            
-            # 5. タスクのstatus_idを新しい共通ステータスIDに更新
-            # status名に基づいてマッピング
-            for task_id, old_status_id, status_name, project_id in tasks:
-                if status_name in status_id_map:
-                    new_status_id = status_id_map[status_name]
-                    conn.execute(text("""
-                        UPDATE tasks
-                        SET status_id = :new_status_id
-                        WHERE id = :task_id
+                # 2. 共通の7つのステータスを作成（project_id=NULL、既にあるものはそのまま使う）
+                #    既存のステータスはタスクの付け替えが終わるまで残す
+                created = 0
+                for status_data in DEFAULT_STATUS_DEFINITIONS:
+                    created += conn.execute(text("""
+                        INSERT INTO statuses (name, display_name, "order", color, project_id, created_at)
+                        SELECT :name, :display_name, :order, :color, NULL, NOW()
+                        WHERE NOT EXISTS (SELECT 1 FROM statuses WHERE project_id IS NULL AND name = :name)
                     """), {
-                        "new_status_id": new_status_id,
-                        "task_id": task_id
-                    })
-            
-            # 6. status名のみでstatus_idがNULLのタスクも更新
-            for status_name, new_status_id in status_id_map.items():
-                conn.execute(text("""
-                    UPDATE tasks
-                    SET status_id = :new_status_id
-                    WHERE status = :status_name AND status_id IS NULL
-                """), {
-                    "new_status_id": new_status_id,
-                    "status_name": status_name
-                })
+                        "name": status_data["name"],
+                        "display_name": status_data["display_name"],
+                        "order": status_data["order"],
+                        "color": status_data["color"]
+                    }).rowcount
+                
+                start_backfill(conn, BACKFILL_NAME)
+                print(f"作成された共通ステータス数: {created}")
             
             trans.commit()
-            print("ステータス共通化マイグレーションが完了しました")
-            print(f"作成された共通ステータス数: {len(status_id_map)}")
         except Exception as e:
             trans.rollback()
             print(f"マイグレーションエラー: {e}")
             raise
+    
+    # 3. タスクのstatus_idをstatus名に対応する共通ステータスのIDに更新
+    # （tasksの主キーの範囲ごとにコミットし、中断した場合は次回の実行時に続きから再開する）
+    updated = run_backfill(
+        engine, BACKFILL_NAME, "tasks",
+        "status_id = (SELECT min(s.id) FROM statuses s WHERE s.project_id IS NULL AND s.name = tasks.status)",
+        """EXISTS (
+            SELECT 1 FROM statuses s
+            WHERE s.project_id IS NULL AND s.name = tasks.status
+        ) AND status_id IS DISTINCT FROM (
+            SELECT min(s.id) FROM statuses s WHERE s.project_id IS NULL AND s.name = tasks.status
+        )""",
+    )
+    
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            # 4. 共通ステータスに対応しないタスクの参照を外してから、古いステータスを削除
+            detached = conn.execute(_with_names(f"""
+                UPDATE tasks SET status_id = NULL
+                WHERE status_id IS NOT NULL AND status_id NOT IN ({COMMON_STATUS_IDS_SQL})
+            """)).rowcount
+            deleted = conn.execute(_with_names(f"""
+                DELETE FROM statuses WHERE id NOT IN ({COMMON_STATUS_IDS_SQL})
+            """)).rowcount
+            finish_backfill(conn, BACKFILL_NAME)
+            # ステータスIDが変わったため、各ワーカーのステータスキャッシュを無効化する
+            bump_version(conn, STATUSES_SCOPE)
+            bump_version(conn, TASKS_SCOPE)
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"マイグレーションエラー: {e}")
+            raise
+    
+    print("ステータス共通化マイグレーションが完了しました")
+    print(f"status_idを更新したタスク数: {updated}")
+    print(f"削除した古いステータス数: {deleted}（参照を外したタスク数: {detached}）")
 
 if __name__ == "__main__":
     migrate()
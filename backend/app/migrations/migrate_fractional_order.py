@@ -0,0 +1,42 @@
+"""
+tasks / todos の "order" カラムを整数から分数順序（DOUBLE PRECISION）に変換するマイグレーション
+既存の整数順序は RANK_STEP 倍して、行の間に中間値を挿入できる間隔を空ける
+"""
+from sqlalchemy import text
+from app.core.database import engine
+from app.core.ranking import RANK_STEP
+
+def migrate():
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            for table_name in ("tasks", "todos"):
+                result = conn.execute(text("""
+                    SELECT data_type
+                    FROM information_schema.columns
+                    WHERE table_name = :table_name AND column_name = 'order'
+                """), {"table_name": table_name})
+                row = result.fetchone()
+                
+                if row is not None and row[0] == "integer":
+                    print(f"{table_name}.orderを分数順序に変換しています...")
+                    conn.execute(text(f"""
+                        ALTER TABLE {table_name}
+                        ALTER COLUMN "order" TYPE DOUBLE PRECISION
+                        USING COALESCE("order", 0)::double precision * {RANK_STEP}
+                    """))
+                    conn.execute(text(f"""
+                        ALTER TABLE {table_name} ALTER COLUMN "order" SET DEFAULT 0
+                    """))
+                    print(f"{table_name}.orderを分数順序に変換しました")
+                else:
+                    print(f"{table_name}.orderは既に分数順序です")
+            
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"分数順序マイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
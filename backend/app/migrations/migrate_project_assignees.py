@@ -0,0 +1,61 @@
+"""
+projects.assignee（JSON配列の文字列）を project_assignees テーブルへ移行するマイグレーション
+projects.assignee はロールバック用にそのまま残す
+（再実行しても ON CONFLICT DO NOTHING により二重に取り込まない）
+"""
+import json
+from sqlalchemy import text
+from app.core.database import engine
+
+def parse_assignees(value: str) -> list:
+    """JSON配列（旧形式のカンマ区切りも許容）を担当者名のリストに変換する"""
+    try:
+        names = json.loads(value)
+    except ValueError:
+        names = value.split(",")
+    if not isinstance(names, list):
+        names = [names]
+    # 重複を除き、入力順を保つ
+    return list(dict.fromkeys(str(name).strip() for name in names if name is not None and str(name).strip()))
+
+def migrate():
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            has_column = conn.execute(text("""
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_name = 'projects' AND column_name = 'assignee'
+            """)).fetchone()
+            if has_column is None:
+                print("projects.assigneeカラムが存在しないため、担当者の移行をスキップします")
+                trans.commit()
+                return
+            
+            rows = conn.execute(text("""
+                SELECT id, assignee FROM projects WHERE assignee IS NOT NULL
+            """)).fetchall()
+            
+            values = [
+                {"project_id": project_id, "assignee": name, "position": position}
+                for project_id, assignee in rows
+                for position, name in enumerate(parse_assignees(assignee))
+            ]
+            if values:
+                conn.execute(text("""
+                    INSERT INTO project_assignees (project_id, assignee, position)
+                    VALUES (:project_id, :assignee, :position)
+                    ON CONFLICT (project_id, assignee) DO NOTHING
+                """), values)
+            
+            if rows:
+                print(f"{len(rows)}件のプロジェクトの担当者を project_assignees に移行しました")
+            
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"プロジェクト担当者移行マイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,49 @@
+"""
+projects.start_month / end_month（YYYY-MM形式の文字列）を DATE（月初日）に変換するマイグレーション
+期間の重なり検索用のGiSTインデックスと、TODOの実行予定日のインデックスも作成する
+（変換済みの場合は型の確認だけで終わる）
+"""
+from sqlalchemy import text
+from app.core.database import engine
+from app.models.models import PROJECT_MONTH_RANGE_SQL
+
+def migrate():
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            rows = conn.execute(text("""
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = 'projects'
+                  AND column_name IN ('start_month', 'end_month')
+                  AND data_type <> 'date'
+            """)).fetchall()
+            
+            for (column_name,) in rows:
+                # YYYY-MM で始まらない値は変換できないため NULL にする
+                conn.execute(text(f"""
+                    ALTER TABLE projects ALTER COLUMN {column_name} TYPE DATE
+                    USING CASE
+                        WHEN {column_name} ~ '^[0-9]{{4}}-(0[1-9]|1[0-2])'
+                        THEN to_date(left({column_name}, 7), 'YYYY-MM')
+                    END
+                """))
+                print(f"projects.{column_name}をDATE型に変換しました")
+            
+            conn.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS ix_projects_month_range
+                ON projects USING gist ({PROJECT_MONTH_RANGE_SQL})
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_todos_scheduled_date
+                ON todos (scheduled_date, task_id)
+            """))
+            
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"プロジェクト期間の型変換マイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
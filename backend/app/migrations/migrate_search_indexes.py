@@ -0,0 +1,22 @@
+"""
+全文検索用のインデックスを作成するマイグレーション
+PostgreSQL: pg_trgm拡張とGINインデックス（tasks.title / tasks.description / todos.title）
+SQLite: FTS5（trigram）の検索用テーブルと同期トリガー
+"""
+from app.core.database import engine
+from app.core.search_index import install_search_index
+
+def migrate():
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            install_search_index(conn)
+            
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"検索インデックスマイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+"""
+タスク件数の集計表（task_stats）を作成し、tasksのトリガーで自動更新するマイグレーション
+トリガー関数は毎回置き換え、集計表はtasksから再集計して初期値を入れる
+"""
+from sqlalchemy import text
+from app.core.database import engine
+from app.core.task_stats import install_triggers, reconcile_task_stats
+
+def migrate():
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS task_stats (
+                    project_id INTEGER NOT NULL,
+                    status_id INTEGER NOT NULL DEFAULT 0,
+                    assignee VARCHAR NOT NULL DEFAULT '',
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (project_id, status_id, assignee)
+                )
+            """))
+            
+            install_triggers(conn)
+            
+            corrected = reconcile_task_stats(conn)
+            if corrected:
+                print(f"task_statsを再集計しました（{corrected}行）")
+            
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"タスク集計表マイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
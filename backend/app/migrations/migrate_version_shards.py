@@ -0,0 +1,45 @@
+"""
+data_versions にシャード番号（shard）を追加し、主キーを (scope, shard) にするマイグレーション
+同じスコープへの同時書き込みが1行の行ロックで直列化しないよう、バージョンを複数の行に分けて加算する
+既存のバージョンは shard = 0 の行に残すため、合計（スコープのバージョン）は変わらない
+"""
+from sqlalchemy import text
+from app.core.database import engine
+from app.models import DataVersion
+
+def migrate():
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            if conn.dialect.name == "postgresql":
+                exists = conn.execute(text("""
+                    SELECT 1
+                    FROM information_schema.columns
+                    WHERE table_name = 'data_versions' AND column_name = 'shard'
+                """)).fetchone()
+                if exists is None:
+                    conn.execute(text("ALTER TABLE data_versions ADD COLUMN shard INTEGER NOT NULL DEFAULT 0"))
+                    conn.execute(text("ALTER TABLE data_versions DROP CONSTRAINT data_versions_pkey"))
+                    conn.execute(text("ALTER TABLE data_versions ADD PRIMARY KEY (scope, shard)"))
+                    print("data_versionsにshardカラムを追加しました")
+            else:
+                # SQLiteは主キーを変更できないため、テーブルを作り直して値を移す
+                columns = {row.name for row in conn.execute(text("PRAGMA table_info(data_versions)"))}
+                if "shard" not in columns:
+                    conn.execute(text("ALTER TABLE data_versions RENAME TO data_versions_old"))
+                    DataVersion.__table__.create(conn)
+                    conn.execute(text("""
+                        INSERT INTO data_versions (scope, shard, version)
+                        SELECT scope, 0, version FROM data_versions_old
+                    """))
+                    conn.execute(text("DROP TABLE data_versions_old"))
+                    print("data_versionsにshardカラムを追加しました")
+            
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            print(f"データバージョン分散マイグレーションエラー: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate()
@@ -1,6 +1,6 @@
 """
 Database models
 """
-from app.models.models import Project, Status, Task, Todo
+from app.models.models import Project, ProjectAssignee, Status, Task, Todo, TaskStat, DataVersion
 
-__all__ = ["Project", "Status", "Task", "Todo"]
+__all__ = ["Project", "ProjectAssignee", "Status", "Task", "Todo", "TaskStat", "DataVersion"]
@@ -1,22 +1,90 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import Column, Integer, Float, String, Boolean, Date, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from app.core.database import Base
 
+class YearMonth(TypeDecorator):
+    """"YYYY-MM" in Python, stored as the first day of the month (DATE) so months can be range-queried"""
+
+    impl = Date
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[date]:
+        if value is None or isinstance(value, date):
+            return value
+        year, month = str(value)[:7].split("-")
+        return date(int(year), int(month), 1)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return f"{value.year:04d}-{value.month:02d}"
+
+# プロジェクトの期間 [start_month, end_monthの翌月) を表すPostgreSQLの範囲式
+# （NULLは無制限、end_month < start_month のデータでもエラーにならないようにGREATESTで補正）
+PROJECT_MONTH_RANGE_SQL = (
+    "daterange(start_month, "
+    "(CASE WHEN end_month IS NOT NULL THEN GREATEST(start_month, end_month) + interval '1 month' END)::date)"
+)
+
 class Project(Base):
     __tablename__ = "projects"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    start_month = Column(String, nullable=True)  # YYYY-MM形式
-    end_month = Column(String, nullable=True)  # YYYY-MM形式
-    assignee = Column(String, nullable=True)  # JSON配列として保存（カンマ区切りまたはJSON）
+    start_month = Column(YearMonth, nullable=True)  # YYYY-MM形式（DBには月初日のDATEで保存）
+    end_month = Column(YearMonth, nullable=True)  # YYYY-MM形式（DBには月初日のDATEで保存）
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
     statuses = relationship("Status", back_populates="project")  # cascadeを削除（共通ステータスは削除しない）
+    # 担当者（一覧取得時はIN句1回でまとめて読み込む）
+    assignee_rows = relationship(
+        "ProjectAssignee", cascade="all, delete-orphan", order_by="ProjectAssignee.position", lazy="selectin"
+    )
+    
+    __table_args__ = (
+        # 期間（start_month〜end_monthの月末）の重なり検索（ガントチャートの表示範囲）
+        Index(
+            "ix_projects_month_range",
+            text(PROJECT_MONTH_RANGE_SQL),
+            postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+    )
+    
+    @property
+    def assignee(self) -> List[str]:
+        """Assignee names in the order they were entered"""
+        return [row.assignee for row in self.assignee_rows]
+    
+    @assignee.setter
+    def assignee(self, names: List[str]) -> None:
+        # 重複を除き、入力順をpositionとして保存する
+        names = list(dict.fromkeys(name for name in names or [] if name))
+        existing = {row.assignee: row for row in self.assignee_rows}
+        rows = []
+        for position, name in enumerate(names):
+            row = existing.get(name) or ProjectAssignee(assignee=name)
+            row.position = position
+            rows.append(row)
+        self.assignee_rows = rows
+
+class ProjectAssignee(Base):
+    __tablename__ = "project_assignees"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    assignee = Column(String, primary_key=True)
+    position = Column(Integer, nullable=False, default=0)  # 入力順
+    
+    __table_args__ = (
+        # 担当者でのプロジェクト絞り込み
+        Index("ix_project_assignees_assignee", "assignee", "project_id"),
+    )
 
 class Status(Base):
     __tablename__ = "statuses"
@@ -31,6 +99,11 @@ class Status(Base):
     
     project = relationship("Project", back_populates="statuses")
     tasks = relationship("Task", back_populates="status_obj")
+    
+    __table_args__ = (
+        # 共通ステータスのname検索・order順一覧用（project_id IS NULL）
+        Index("ix_statuses_common_name", "name", "order", postgresql_where=text("project_id IS NULL")),
+    )
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -42,7 +115,7 @@ class Task(Base):
     status_id = Column(Integer, ForeignKey("statuses.id"), nullable=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     assignee = Column(String, nullable=True)  # 担当者（個人タスク用）
-    order = Column(Integer, default=0)
+    order = Column(Float, default=0)  # 分数順序（移動時は前後の中間値を設定）
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -50,6 +123,17 @@ class Task(Base):
     project = relationship("Project", back_populates="tasks")
     status_obj = relationship("Status", back_populates="tasks")
     todos = relationship("Todo", back_populates="task", cascade="all, delete-orphan", order_by="Todo.order")
+    
+    __table_args__ = (
+        # プロジェクト別のボード表示（status_id, order順）
+        Index("ix_tasks_project_status_order", "project_id", "status_id", "order", "id"),
+        # 担当者での絞り込み
+        Index("ix_tasks_assignee_project", "assignee", "project_id"),
+        # 個人タスク（project_id=-1）の担当者別表示
+        Index("ix_tasks_personal_assignee", "assignee", "status_id", "order", postgresql_where=text("project_id = -1")),
+        # 絞り込みなしの一覧・カーソルページング
+        Index("ix_tasks_status_order_id", "status_id", "order", "id"),
+    )
 
 class Todo(Base):
     __tablename__ = "todos"
@@ -58,10 +142,35 @@ class Todo(Base):
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     title = Column(String, nullable=False)
     completed = Column(Boolean, default=False)
-    order = Column(Integer, default=0)
+    order = Column(Float, default=0)  # 分数順序（移動時は前後の中間値を設定）
     scheduled_date = Column(DateTime(timezone=True), nullable=True)  # 実行予定日
     completed_date = Column(DateTime(timezone=True), nullable=True)  # 実行完了日
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    task = relationship("Task", back_populates="todos")
\ No newline at end of file
+    task = relationship("Task", back_populates="todos")
+    
+    __table_args__ = (
+        # タスクごとのTODO取得（order順）
+        Index("ix_todos_task_order", "task_id", "order"),
+        # TODO一覧・カーソルページング
+        Index("ix_todos_order_id", "order", "id"),
+        # 実行予定日の範囲検索（タイムラインのプロジェクト別集計）
+        Index("ix_todos_scheduled_date", "scheduled_date", "task_id"),
+    )
+
+class TaskStat(Base):
+    __tablename__ = "task_stats"
+
+    # タスク件数の集計表（PostgreSQLではtasksのトリガーで増減する）
+    project_id = Column(Integer, primary_key=True)
+    status_id = Column(Integer, primary_key=True, default=0)  # 0: ステータスなし
+    assignee = Column(String, primary_key=True, default="")  # 空文字: 担当者なし
+    count = Column(Integer, nullable=False, default=0)
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True)  # キャッシュ対象の範囲（例: statuses）
+    shard = Column(Integer, primary_key=True, autoincrement=False, default=0)  # 同時更新を分散する行の番号
+    version = Column(Integer, nullable=False, default=0)  # 更新のたびにいずれかの行が+1される（スコープのバージョンは合計）
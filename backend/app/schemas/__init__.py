@@ -1,14 +1,30 @@
 """
 Pydantic schemas
 """
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskMove, TaskPosition
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 from app.schemas.status import StatusCreate, StatusUpdate, StatusResponse
-from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
+from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse, TodoPosition
+from app.schemas.board import BoardTaskResponse, BoardColumn, BoardResponse
+from app.schemas.bulk import BulkMode, BulkItemError, BulkRequest, TaskBulkResponse, TodoBulkResponse
+from app.schemas.assignee import AssigneeResponse
+from app.schemas.admin import PoolWaitTimes, PoolStatsResponse, PoolStatusResponse
+from app.schemas.stats import StatusCount, ProjectCount, AssigneeCount, StatsResponse, TaskStatsReconcileResponse
+from app.schemas.grid import GridSortItem, GridColumn, GridRowsRequest, GridRowsResponse
+from app.schemas.timeline import TimelineProject, TimelineResponse
+from app.schemas.search import SearchHit, SearchResponse
 
 __all__ = [
-    "TaskCreate", "TaskUpdate", "TaskResponse",
+    "TaskCreate", "TaskUpdate", "TaskResponse", "TaskMove", "TaskPosition",
     "ProjectCreate", "ProjectUpdate", "ProjectResponse",
     "StatusCreate", "StatusUpdate", "StatusResponse",
-    "TodoCreate", "TodoUpdate", "TodoResponse",
+    "TodoCreate", "TodoUpdate", "TodoResponse", "TodoPosition",
+    "BoardTaskResponse", "BoardColumn", "BoardResponse",
+    "BulkMode", "BulkItemError", "BulkRequest", "TaskBulkResponse", "TodoBulkResponse",
+    "AssigneeResponse",
+    "PoolWaitTimes", "PoolStatsResponse", "PoolStatusResponse",
+    "StatusCount", "ProjectCount", "AssigneeCount", "StatsResponse", "TaskStatsReconcileResponse",
+    "GridSortItem", "GridColumn", "GridRowsRequest", "GridRowsResponse",
+    "TimelineProject", "TimelineResponse",
+    "SearchHit", "SearchResponse",
 ]
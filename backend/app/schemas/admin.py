@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List
+
+class PoolWaitTimes(BaseModel):
+    p50: float  # 接続待ち時間（ミリ秒、直近DB_POOL_STATS_WINDOW回の貸し出し）
+    p95: float
+    p99: float
+    max: float
+
+class PoolStatsResponse(BaseModel):
+    engine: str  # sync / async
+    size: int  # 常時保持する接続数（pool_size）
+    checked_out: int  # 貸し出し中の接続数
+    checked_in: int  # プール内の空き接続数
+    overflow: int  # pool_sizeを超えて開いている接続数
+    max_overflow: int
+    checkouts: int  # 以下はプロセス起動からの累計
+    checkins: int
+    waits: int  # 空き接続がなく待たされた貸し出し数
+    timeouts: int  # DB_POOL_TIMEOUTを超えて失敗した貸し出し数
+    connects: int
+    invalidations: int
+    wait_ms: PoolWaitTimes
+
+class PoolStatusResponse(BaseModel):
+    pools: List[PoolStatsResponse]
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+class AssigneeResponse(BaseModel):
+    name: str
+    open_tasks: int = 0  # 未完了タスク数（完了・中止・本番反映済みを除く）
+    tasks: int = 0  # 担当タスク数
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+from app.schemas.status import StatusResponse
+from app.schemas.task import TaskResponse
+from app.schemas.todo import TodoResponse
+
+class BoardTaskResponse(TaskResponse):
+    todos: List[TodoResponse] = []  # タスクのTODO一覧（order順）
+
+class BoardColumn(BaseModel):
+    status: Optional[StatusResponse] = None  # ステータス（どのステータスにも属さないタスクの列はNone）
+    tasks: List[BoardTaskResponse] = []
+
+class BoardResponse(BaseModel):
+    statuses: List[StatusResponse]  # 共通ステータス（order順）
+    columns: List[BoardColumn]  # ステータスごとにグループ化したタスク
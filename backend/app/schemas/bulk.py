@@ -0,0 +1,34 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+from app.schemas.task import TaskResponse
+from app.schemas.todo import TodoResponse
+
+class BulkMode(str, Enum):
+    atomic = "atomic"  # 1件でもエラーがあれば何も反映しない
+    best_effort = "best_effort"  # エラーの項目だけをスキップして残りを反映する
+
+class BulkItemError(BaseModel):
+    op: str  # create / update / delete
+    index: int  # リクエスト内の配列インデックス
+    id: Optional[int] = None
+    detail: Any
+
+class BulkRequest(BaseModel):
+    mode: BulkMode = BulkMode.atomic
+    create: List[Dict[str, Any]] = []  # 作成する項目（TaskCreate / TodoCreate）
+    update: List[Dict[str, Any]] = []  # 更新する項目（id + TaskUpdate / TodoUpdate）
+    delete: List[int] = []  # 削除するID
+
+class TaskBulkResponse(BaseModel):
+    created: List[TaskResponse] = []
+    updated: List[TaskResponse] = []
+    deleted: List[int] = []
+    errors: List[BulkItemError] = []
+
+class TodoBulkResponse(BaseModel):
+    created: List[TodoResponse] = []
+    updated: List[TodoResponse] = []
+    deleted: List[int] = []
+    errors: List[BulkItemError] = []
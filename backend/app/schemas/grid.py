@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+
+class GridSortItem(BaseModel):
+    colId: str
+    sort: Literal["asc", "desc"]
+
+class GridColumn(BaseModel):
+    id: str
+    field: Optional[str] = None
+
+class GridRowsRequest(BaseModel):
+    startRow: int = 0
+    endRow: int = 100
+    sortModel: List[GridSortItem] = []
+    filterModel: Optional[Dict[str, Any]] = None  # AG Gridのフィルタモデル（colId -> フィルタ）
+    rowGroupCols: List[GridColumn] = []  # グループ化する列（外側から順に）
+    groupKeys: List[Optional[str]] = []  # 展開中のグループのキー（外側から順に）
+
+class GridRowsResponse(BaseModel):
+    rows: List[Dict[str, Any]]
+    rowCount: int  # 条件に一致する全行数（グループ階層ではグループ数）
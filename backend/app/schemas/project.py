@@ -1,7 +1,19 @@
-from pydantic import BaseModel
+import re
+from pydantic import BaseModel, field_validator
+from pydantic_core import PydanticCustomError
 from datetime import datetime
 from typing import Optional, List
 
+MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+def validate_month(value: Optional[str]) -> Optional[str]:
+    """Accept "YYYY-MM" (an empty string means not set)"""
+    if not value:
+        return None
+    if not MONTH_PATTERN.match(value):
+        raise PydanticCustomError("month_format", "must be in YYYY-MM format")
+    return value
+
 class ProjectBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -9,6 +21,8 @@ class ProjectBase(BaseModel):
     end_month: Optional[str] = None  # YYYY-MM形式
     assignee: Optional[List[str]] = None  # 担当者リスト
 
+    _check_months = field_validator("start_month", "end_month")(validate_month)
+
 class ProjectCreate(ProjectBase):
     pass
 
@@ -19,6 +33,8 @@ class ProjectUpdate(BaseModel):
     end_month: Optional[str] = None
     assignee: Optional[List[str]] = None
 
+    _check_months = field_validator("start_month", "end_month")(validate_month)
+
 class ProjectResponse(ProjectBase):
     id: int
     created_at: datetime
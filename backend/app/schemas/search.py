@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+class SearchHit(BaseModel):
+    type: Literal["task", "todo"]
+    id: int  # タスクID または TODO ID
+    task_id: int  # TODOの場合は親タスクのID
+    project_id: int
+    project_name: Optional[str] = None
+    title: str
+    task_title: str  # TODOの場合は親タスクのタイトル
+    score: float  # 大きいほど一致度が高い
+
+class SearchResponse(BaseModel):
+    q: str
+    hits: List[SearchHit]
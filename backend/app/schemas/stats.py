@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class StatusCount(BaseModel):
+    status_id: Optional[int] = None  # ステータス未設定のタスクはNone
+    name: Optional[str] = None
+    display_name: Optional[str] = None
+    count: int
+
+class ProjectCount(BaseModel):
+    project_id: int  # -1: 個人タスク
+    name: Optional[str] = None
+    count: int
+
+class AssigneeCount(BaseModel):
+    assignee: Optional[str] = None  # 担当者未設定のタスクはNone
+    count: int
+
+class StatsResponse(BaseModel):
+    total: int  # タスク総数
+    by_status: List[StatusCount]
+    by_project: List[ProjectCount]
+    by_assignee: List[AssigneeCount]
+
+class TaskStatsReconcileResponse(BaseModel):
+    corrected: Optional[int] = None  # 修正した集計行の数（他のワーカーが再集計中の場合はNone）
@@ -7,19 +7,19 @@ class TaskBase(BaseModel):
     description: Optional[str] = None
     status: str = "not_started"  # ステータス名を文字列で保存（デフォルトは「未実行」）
     status_id: Optional[int] = None  # ステータスID
-    order: int = 0  # 同じステータス内での順序
+    order: float = 0  # 同じステータス内での順序（分数順序）
     completed: bool = False  # 後方互換性のため残す
     project_id: int  # プロジェクトID（-1の場合は個人タスク）
     assignee: Optional[str] = None  # 担当者（個人タスク用、project_id=-1の場合に使用）
 
 class TaskCreate(TaskBase):
-    pass
+    order: Optional[float] = None  # 省略時は列の末尾
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
-    order: Optional[int] = None
+    order: Optional[float] = None
     completed: Optional[bool] = None
     project_id: Optional[int] = None
     assignee: Optional[str] = None
@@ -31,3 +31,13 @@ class TaskResponse(TaskBase):
 
     class Config:
         from_attributes = True
+
+class TaskMove(BaseModel):
+    id: int
+    status: str  # 移動先のステータス名
+    order: float  # 移動先ステータス内での順序
+
+class TaskPosition(BaseModel):
+    status: Optional[str] = None  # 移動先のステータス名（省略時は現在のステータス）
+    after_id: Optional[int] = None  # 直前に来るタスクのID（先頭に移動する場合はNone）
+    before_id: Optional[int] = None  # 直後に来るタスクのID（末尾に移動する場合はNone）
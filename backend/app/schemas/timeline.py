@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class TimelineProject(BaseModel):
+    id: int
+    name: str
+    start_month: Optional[str] = None  # YYYY-MM形式
+    end_month: Optional[str] = None  # YYYY-MM形式
+    todo_start: Optional[datetime] = None  # 表示範囲内のTODOの最も早い実行予定日
+    todo_end: Optional[datetime] = None  # 表示範囲内のTODOの最も遅い実行予定日
+    todo_count: int = 0  # 表示範囲内に実行予定日があるTODOの数
+
+class TimelineResponse(BaseModel):
+    from_month: str  # 表示範囲の開始月（YYYY-MM形式）
+    to_month: str  # 表示範囲の終了月（YYYY-MM形式、この月を含む）
+    projects: List[TimelineProject]
@@ -5,17 +5,18 @@ from typing import Optional
 class TodoBase(BaseModel):
     title: str
     completed: bool = False
-    order: int = 0
+    order: float = 0  # 分数順序
     scheduled_date: Optional[date] = None  # 実行予定日
     completed_date: Optional[date] = None  # 実行完了日
 
 class TodoCreate(TodoBase):
     task_id: int
+    order: Optional[float] = None  # 省略時は列の末尾
 
 class TodoUpdate(BaseModel):
     title: Optional[str] = None
     completed: Optional[bool] = None
-    order: Optional[int] = None
+    order: Optional[float] = None
     scheduled_date: Optional[date] = None
     completed_date: Optional[date] = None
 
@@ -27,3 +28,7 @@ class TodoResponse(TodoBase):
 
     class Config:
         from_attributes = True
+
+class TodoPosition(BaseModel):
+    after_id: Optional[int] = None  # 直前に来るTODOのID（先頭に移動する場合はNone）
+    before_id: Optional[int] = None  # 直後に来るTODOのID（末尾に移動する場合はNone）
@@ -0,0 +1,14 @@
+"""
+Benchmarks and query plan checks (run against a throwaway database)
+
+Importing this package points DATABASE_URL at BENCHMARK_DATABASE_URL before
+any app module is loaded, so the application engine, its sessions and every
+module that binds to them at import time use the benchmark database.
+"""
+import os
+
+# 切り替え前のアプリケーションの接続先（seed.get_benchmark_engine が誤ってこれを使わないよう確認する）
+APPLICATION_DATABASE_URL = os.environ.get("DATABASE_URL")
+
+if os.getenv("BENCHMARK_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCHMARK_DATABASE_URL"]
@@ -0,0 +1,123 @@
+"""
+Seed a throwaway PostgreSQL database with a parameterized dataset
+"""
+import os
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import DEFAULT_DATABASE_URL
+from app.core.constants import DEFAULT_STATUS_DEFINITIONS
+from app.core.database import Base
+from app.core.search_index import install_search_index
+from app.core.task_stats import install_triggers, reconcile_task_stats
+from benchmarks import APPLICATION_DATABASE_URL
+import app.models  # noqa: F401  テーブル定義をBase.metadataに登録する
+
+
+@dataclass
+class Dataset:
+    """Dataset size (personal_every: every N-th task becomes a personal task with project_id=-1)"""
+    projects: int = 200
+    tasks_per_project: int = 500
+    todos_per_task: int = 10
+    assignees: int = 50
+    personal_every: int = 10
+
+    @property
+    def tasks(self) -> int:
+        return self.projects * self.tasks_per_project
+
+
+def get_benchmark_engine() -> Engine:
+    """Create an engine for BENCHMARK_DATABASE_URL (refuses to run against the application database)"""
+    url = os.getenv("BENCHMARK_DATABASE_URL")
+    if not url:
+        raise SystemExit("BENCHMARK_DATABASE_URL is not set (use a throwaway database, it will be dropped)")
+    if url == (APPLICATION_DATABASE_URL or DEFAULT_DATABASE_URL):
+        raise SystemExit("BENCHMARK_DATABASE_URL must not point to the application database")
+    return create_engine(url)
+
+
+def seed(engine: Engine, dataset: Dataset) -> None:
+    """Drop and recreate all tables, then bulk insert the dataset with generate_series"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO projects (id, name, description)
+            VALUES (-1, '個人タスク（システム用）', '個人タスク用のダミープロジェクト')
+        """))
+        
+        for status_data in DEFAULT_STATUS_DEFINITIONS:
+            conn.execute(text("""
+                INSERT INTO statuses (name, display_name, "order", color, project_id)
+                VALUES (:name, :display_name, :order, :color, NULL)
+            """), status_data)
+        
+        conn.execute(text("""
+            INSERT INTO projects (name, description, start_month, end_month)
+            SELECT
+                'Project ' || g,
+                'Benchmark project ' || g,
+                (DATE '2024-01-01' + ((g % 24) || ' months')::interval)::date,
+                (DATE '2024-01-01' + ((g % 24 + 6) || ' months')::interval)::date
+            FROM generate_series(1, :projects) AS g
+        """), {"projects": dataset.projects})
+        
+        # プロジェクトごとに担当者を2人割り当てる
+        conn.execute(text("""
+            INSERT INTO project_assignees (project_id, assignee, position)
+            SELECT p.id, 'user' || ((p.id + n) % :assignees), n
+            FROM projects p
+            CROSS JOIN generate_series(0, 1) AS n
+            WHERE p.id > 0
+        """), {"assignees": dataset.assignees})
+        
+        conn.execute(text("""
+            INSERT INTO tasks (title, description, status, status_id, project_id, assignee, "order", completed)
+            SELECT
+                'Task ' || g,
+                'Benchmark task description ' || g,
+                s.name,
+                s.id,
+                CASE WHEN g % :personal_every = 0 THEN -1 ELSE p.id END,
+                'user' || (g % :assignees),
+                g / :projects,
+                FALSE
+            FROM generate_series(1, :tasks) AS g
+            JOIN statuses s ON s.project_id IS NULL AND s."order" = g % :status_count
+            JOIN projects p ON p.id = (g % :projects) + 1
+        """), {
+            "tasks": dataset.tasks,
+            "projects": dataset.projects,
+            "assignees": dataset.assignees,
+            "personal_every": dataset.personal_every,
+            "status_count": len(DEFAULT_STATUS_DEFINITIONS),
+        })
+        
+        conn.execute(text("""
+            INSERT INTO todos (task_id, title, completed, "order", scheduled_date, completed_date)
+            SELECT
+                t.id,
+                'Todo ' || t.id || '-' || n,
+                n % 3 = 0,
+                n,
+                TIMESTAMP WITH TIME ZONE '2024-01-01' + ((t.id % 365) || ' days')::interval,
+                CASE WHEN n % 3 = 0 THEN TIMESTAMP WITH TIME ZONE '2024-01-02' + ((t.id % 365) || ' days')::interval END
+            FROM tasks t
+            CROSS JOIN generate_series(0, :todos_per_task - 1) AS n
+        """), {"todos_per_task": dataset.todos_per_task})
+        
+        # 検索用のトライグラムインデックスは投入後にまとめて作る
+        install_search_index(conn)
+        
+        # 集計表はアプリケーションと同じくトリガーで維持し、投入済みの行は再集計で反映する
+        install_triggers(conn)
+        reconcile_task_stats(conn)
+    
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+
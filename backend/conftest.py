@@ -0,0 +1,79 @@
+"""
+Shared pytest fixtures
+
+    def test_todo_listing_queries(client, query_counter):
+        client.get("/api/v1/todos")
+        query_counter.assert_max(3)
+"""
+import os
+import shutil
+import tempfile
+from typing import List
+
+# アプリのモジュールを読み込む前に、使い捨てのSQLiteデータベースを接続先にする
+# （設定済みのDATABASE_URL（既定は本番のPostgreSQL）には接続しない。テーブルは起動時にcreate_allで作成される）
+_TEST_DATABASE_DIR = tempfile.mkdtemp(prefix="taskapp-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DATABASE_DIR, 'test.db')}"
+os.environ["DATABASE_MODE"] = "sync"
+os.environ["EVENT_BROKER"] = "memory"
+os.environ["METRICS_ENABLED"] = "true"
+# ステータスキャッシュの再確認でクエリ数が変わらないようにする
+os.environ["STATUS_CACHE_CHECK_INTERVAL"] = "3600"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.metrics import CapturedRequest, capture_requests  # noqa: E402
+from app.core.query_budget import format_statements  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_TEST_DATABASE_DIR, ignore_errors=True)
+
+
+class QueryCounter:
+    """SQL statements executed by the requests made during a test"""
+
+    def __init__(self, captured: List[CapturedRequest]):
+        self.requests = captured
+
+    @property
+    def last(self) -> CapturedRequest:
+        assert self.requests, "no request was made"
+        return self.requests[-1]
+
+    @property
+    def count(self) -> int:
+        """Statements executed by the last request"""
+        return self.last.metrics.queries
+
+    def assert_max(self, max_queries: int) -> None:
+        """Assert the last request executed at most max_queries statements"""
+        request = self.last
+        assert request.metrics.queries <= max_queries, (
+            f"{request.method} {request.route} executed {request.metrics.queries} queries "
+            f"(expected <= {max_queries}):\n{format_statements(request.metrics.statements)}"
+        )
+
+    def assert_within_budgets(self) -> None:
+        """Assert every request stayed within the budget declared on its route (@query_budget)"""
+        for request in self.requests:
+            if request.budget is not None:
+                assert request.metrics.queries <= request.budget, (
+                    f"{request.method} {request.route} executed {request.metrics.queries} queries "
+                    f"(budget {request.budget}):\n{format_statements(request.metrics.statements)}"
+                )
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def query_counter() -> QueryCounter:
+    with capture_requests() as captured:
+        yield QueryCounter(captured)
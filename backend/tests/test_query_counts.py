@@ -0,0 +1,91 @@
+"""
+Per-endpoint query-count assertions
+
+Each test issues one request against a seeded throwaway database and asserts
+the number of statements it executed, so N+1 regressions fail here instead of
+showing up as latency in production.
+"""
+import pytest
+
+
+@pytest.fixture(scope="module")
+def dataset(client):
+    """Projects, project/personal tasks and todos created through the API"""
+    projects = [
+        client.post("/api/v1/projects", json={"name": f"Project {i}", "assignee": ["alice", "bob"]}).json()
+        for i in range(3)
+    ]
+    
+    tasks = []
+    for project in projects:
+        for i, status in enumerate(["not_started", "in_progress", "review_pending", "not_started"]):
+            response = client.post("/api/v1/tasks", json={
+                "title": f"Task {i}",
+                "project_id": project["id"],
+                "status": status,
+                "assignee": "alice" if i % 2 else "bob",
+            })
+            assert response.status_code == 200
+            tasks.append(response.json())
+    # 個人タスク（project_id = -1）
+    response = client.post("/api/v1/tasks", json={"title": "Personal", "project_id": -1, "assignee": "alice"})
+    assert response.status_code == 200
+    tasks.append(response.json())
+    
+    for task in tasks:
+        for i in range(3):
+            response = client.post(f"/api/v1/tasks/{task['id']}/todos", json={
+                "title": f"Todo {i}",
+                "task_id": task["id"],
+                "scheduled_date": "2024-05-01",
+            })
+            assert response.status_code == 200
+    
+    # ステータスレジストリを温めておく
+    client.get("/api/v1/statuses")
+    return {"projects": projects, "tasks": tasks}
+
+
+# (method, path, body, 許容クエリ数)
+CASES = [
+    ("get", "/api/v1/todos", None, 2),
+    ("get", "/api/v1/tasks", None, 2),
+    ("get", "/api/v1/projects", None, 3),
+    ("get", "/api/v1/projects/{project_id}/assignees", None, 3),
+    ("get", "/api/v1/boards", None, 3),
+    ("get", "/api/v1/stats", None, 2),
+    ("post", "/api/v1/todos/rows", {"startRow": 0, "endRow": 50}, 1),
+    ("post", "/api/v1/todos/rows", {
+        "startRow": 0,
+        "endRow": 50,
+        "rowGroupCols": [{"id": "project_name", "field": "project_name"}],
+    }, 1),
+    ("get", "/api/v1/assignees", None, 3),
+    ("get", "/api/v1/timeline?from=2024-04&to=2024-06", None, 2),
+    ("get", "/api/v1/search?q=Todo", None, 2),
+]
+
+
+@pytest.mark.parametrize("method,path,body,max_queries", CASES)
+def test_endpoint_query_count(client, query_counter, dataset, method, path, body, max_queries):
+    """Listing endpoints stay within a fixed number of statements"""
+    path = path.format(project_id=dataset["projects"][0]["id"])
+    kwargs = {"json": body} if body is not None else {}
+    response = getattr(client, method)(path, **kwargs)
+    
+    assert response.status_code == 200, response.text
+    query_counter.assert_max(max_queries)
+    query_counter.assert_within_budgets()
+
+
+def test_todo_listing_does_not_grow_with_rows(client, query_counter, dataset):
+    """Adding todos does not add statements to the todo listing"""
+    client.get("/api/v1/todos")
+    before = query_counter.count
+    
+    task = dataset["tasks"][0]
+    for i in range(5):
+        client.post(f"/api/v1/tasks/{task['id']}/todos", json={"title": f"Extra {i}", "task_id": task["id"]})
+    
+    client.get("/api/v1/todos")
+    assert query_counter.count == before
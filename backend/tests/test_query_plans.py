@@ -0,0 +1,36 @@
+"""
+Query plan checks for the router statements
+
+Seeds the benchmark dataset into BENCHMARK_DATABASE_URL (a throwaway PostgreSQL
+database) and asserts that none of benchmarks.query_plans.CHECKS falls back to a
+sequential scan. Skipped when BENCHMARK_DATABASE_URL is not set.
+"""
+import os
+
+import pytest
+
+if not os.getenv("BENCHMARK_DATABASE_URL"):
+    pytest.skip("BENCHMARK_DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from benchmarks.query_plans import CHECKS, DATASET, explain, seq_scans  # noqa: E402
+from benchmarks.seed import get_benchmark_engine, seed  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def benchmark_db():
+    engine = get_benchmark_engine()
+    if not os.getenv("BENCHMARK_NO_SEED"):
+        seed(engine, DATASET)
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name,build,disable_seqscan", CHECKS, ids=[check[0] for check in CHECKS])
+def test_no_seq_scan(benchmark_db, name, build, disable_seqscan):
+    """The router statement is answered from indexes"""
+    plan = explain(benchmark_db, build(benchmark_db), disable_seqscan)
+    assert seq_scans(plan) == [], f"{name}: Seq Scan in {plan}"
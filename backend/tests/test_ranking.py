@@ -0,0 +1,60 @@
+"""
+Moves between neighbours that have no room for a midpoint
+"""
+from app.core.ranking import RANK_STEP, RESPACE_WINDOW
+
+
+def _column(client, orders):
+    """A project whose not_started column holds one task per order"""
+    project = client.post("/api/v1/projects", json={"name": "Ranking"}).json()
+    tasks = [
+        client.post("/api/v1/tasks", json={"title": f"Task {i}", "project_id": project["id"]}).json()
+        for i in range(len(orders))
+    ]
+    response = client.patch("/api/v1/tasks/reorder", json=[
+        {"id": task["id"], "status": "not_started", "order": order} for task, order in zip(tasks, orders)
+    ])
+    assert response.status_code == 200
+    return project, tasks
+
+
+def _orders(client, project):
+    tasks = client.get("/api/v1/tasks", params={"project_id": project["id"]}).json()
+    return {task["id"]: task["order"] for task in tasks}, [task["id"] for task in tasks]
+
+
+def test_move_into_collapsed_gap_only_respaces_a_window(client):
+    # 中央の2 * RESPACE_WINDOW件だけが同じ値に潰れている列（末尾は移動するタスク）
+    collapsed = 2 * RESPACE_WINDOW * RANK_STEP
+    orders = [
+        collapsed if RESPACE_WINDOW <= i < 3 * RESPACE_WINDOW else i * RANK_STEP
+        for i in range(4 * RESPACE_WINDOW + 1)
+    ]
+    project, tasks = _column(client, orders)
+    ids = [task["id"] for task in tasks]
+    moved = ids.pop()
+    after_id, before_id = ids[2 * RESPACE_WINDOW - 1], ids[2 * RESPACE_WINDOW]
+    
+    response = client.put(f"/api/v1/tasks/{moved}/position", json={"after_id": after_id, "before_id": before_id})
+    assert response.status_code == 200
+    
+    orders, sequence = _orders(client, project)
+    expected = ids[:2 * RESPACE_WINDOW] + [moved] + ids[2 * RESPACE_WINDOW:]
+    assert sequence == expected
+    assert orders[after_id] < orders[moved] < orders[before_id]
+    # 挿入位置から離れた要素は書き換えない
+    assert orders[ids[RESPACE_WINDOW - 1]] == (RESPACE_WINDOW - 1) * RANK_STEP
+    assert orders[ids[3 * RESPACE_WINDOW]] == 3 * RESPACE_WINDOW * RANK_STEP
+
+
+def test_move_into_collapsed_gap_widens_to_column_edge(client):
+    project, tasks = _column(client, [7.0] * 4)
+    ids = [task["id"] for task in tasks]
+    moved = ids.pop(0)
+    
+    response = client.put(f"/api/v1/tasks/{moved}/position", json={"after_id": ids[0], "before_id": ids[1]})
+    assert response.status_code == 200
+    
+    orders, sequence = _orders(client, project)
+    assert sequence == [ids[0], moved, ids[1], ids[2]]
+    assert len(set(orders.values())) == 4
@@ -1,4 +1,15 @@
 import { ref } from 'vue'
+import type { Todo } from './useTodos'
+
+export type Status = {
+  id: number
+  name: string
+  display_name: string
+  order: number
+  color: string
+  project_id: number | null
+  created_at?: string
+}
 
 export type Task = {
   id: number
@@ -14,6 +25,20 @@ export type Task = {
   updated_at?: string | null
 }
 
+export type BoardTask = Task & {
+  todos: Todo[]
+}
+
+export type BoardColumn = {
+  status: Status | null  // どのステータスにも属さないタスクの列はnull
+  tasks: BoardTask[]
+}
+
+export type Board = {
+  statuses: Status[]
+  columns: BoardColumn[]
+}
+
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
 export const useTasks = () => {
@@ -60,8 +85,50 @@ export const useTasks = () => {
     }
   }
 
-  // タスクを作成
-  const createTask = async (task: Omit<Task, 'id' | 'created_at' | 'updated_at'>) => {
+  // ボード（ステータス・タスク・TODO）を一括取得
+  const fetchBoard = async (projectId?: number, projectIds?: number[], assignee?: string): Promise<Board | null> => {
+    loading.value = true
+    error.value = null
+    try {
+      let url = `${API_URL}/api/v1/boards`
+      const params = new URLSearchParams()
+      
+      if (projectId !== undefined) {
+        params.append('project_id', projectId.toString())
+      } else if (projectIds && projectIds.length > 0) {
+        params.append('project_ids', projectIds.join(','))
+      }
+      
+      if (assignee) {
+        params.append('assignee', assignee)
+      }
+      
+      if (params.toString()) {
+        url += `?${params.toString()}`
+      }
+      
+      const response = await fetch(url)
+      if (!response.ok) {
+        const errorText = await response.text()
+        console.error('Error response:', response.status, errorText)
+        throw new Error(`HTTP error! status: ${response.status}`)
+      }
+      const data: Board = await response.json()
+      tasks.value = data.columns.flatMap((column: BoardColumn) =>
+        column.tasks.map(({ todos, ...task }: BoardTask) => task)
+      )
+      return data
+    } catch (e) {
+      error.value = e instanceof Error ? e.message : 'ボードの取得に失敗しました'
+      console.error('Error fetching board:', e)
+      return null
+    } finally {
+      loading.value = false
+    }
+  }
+
+  // タスクを作成（orderを省略するとサーバー側で列の末尾に配置される）
+  const createTask = async (task: Omit<Task, 'id' | 'created_at' | 'updated_at' | 'order'> & { order?: number }) => {
     loading.value = true
     error.value = null
     try {
@@ -143,6 +210,7 @@ export const useTasks = () => {
     loading,
     error,
     fetchTasks,
+    fetchBoard,
     createTask,
     updateTask,
     deleteTask,
@@ -12,6 +12,19 @@ export type Todo = {
   updated_at?: string | null
 }
 
+// AG Gridの行モデルのリクエスト（startRow〜endRowのブロック）
+export type TodoRowsRequest = {
+  startRow: number
+  endRow: number
+  sortModel: Array<{ colId: string; sort: 'asc' | 'desc' }>
+  filterModel: Record<string, any> | null
+}
+
+export type TodoRowsResponse = {
+  rows: Array<Record<string, any>>
+  rowCount: number  // 条件に一致する全行数
+}
+
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
 export const useTodos = () => {
@@ -61,7 +74,6 @@ export const useTodos = () => {
           task_id: taskId,
           title: title,
           completed: false,
-          order: 0,
         }),
       })
       if (!response.ok) {
@@ -172,12 +184,35 @@ export const useTodos = () => {
     }
   }
 
+  // AG Gridの行モデル用にTODOの1ブロックを取得（ソート・フィルタはサーバー側で処理）
+  const fetchTodoRows = async (request: TodoRowsRequest): Promise<TodoRowsResponse> => {
+    error.value = null
+    try {
+      const response = await fetch(`${API_URL}/api/v1/todos/rows`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(request),
+      })
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`)
+      }
+      return await response.json()
+    } catch (e) {
+      error.value = e instanceof Error ? e.message : 'TODOの取得に失敗しました'
+      console.error('Error fetching todo rows:', e)
+      throw e
+    }
+  }
+
   return {
     todos,
     loading,
     error,
     fetchTodos,
     fetchAllTodos,
+    fetchTodoRows,
     createTodo,
     updateTodo,
     deleteTodo,
@@ -26,3 +26,13 @@ export const RESTORE_STATE_TIMEOUTS = {
   GRID_READY: 300,
   FIRST_DATA_RENDERED: 500,
 } as const
+
+/**
+ * 無限スクロール行モデルで1回に取得する行数（ブロックサイズ）
+ */
+export const CACHE_BLOCK_SIZE = 100
+
+/**
+ * 無限スクロール行モデルで保持するブロック数の上限
+ */
+export const MAX_BLOCKS_IN_CACHE = 10